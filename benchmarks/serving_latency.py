@@ -0,0 +1,154 @@
+"""
+Offline latency and throughput benchmark of the serving path.
+
+Trains a small model on notebooks/data.csv, publishes it as a LocalModelSource version
+(no registry or network needed) and times each stage of a prediction on its own:
+
+    normalize   normalize_text(review)
+    transform   vectorizer.transform([text])
+    predict     model.predict(features)
+    route       POST /predict through the Flask test client
+
+for every combination of review length (words) and concurrency (threads). p50/p95/p99
+latencies and throughput go to a JSON file so runs can be compared:
+
+    python -m benchmarks.serving_latency --lengths 20 200 1000 --concurrency 1 4 16
+"""
+import os
+import sys
+import json
+import time
+import pickle
+import argparse
+import platform
+import tempfile
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from src.text import normalize_text
+from src.serving import LinearScorer, LocalModelSource, ModelStore
+
+STAGES = ("normalize", "transform", "predict", "route")
+
+def train_local_model(data_path: str, model_root: str, max_features: int = 50, version: str = "1") -> str:
+    """
+    Train the pipeline's BoW + logistic regression model and publish it under model_root
+    in the LocalModelSource layout, with an exported scorer for the "numpy" backend.
+    """
+    df = pd.read_csv(data_path)
+    df = df[df['sentiment'].isin(['positive', 'negative'])]
+    texts = [normalize_text(review) for review in df['review']]
+    labels = (df['sentiment'] == 'positive').astype(int).values
+
+    vectorizer = CountVectorizer(max_features=max_features)
+    model = LogisticRegression(C=1, solver='liblinear', penalty='l2').fit(vectorizer.fit_transform(texts), labels)
+
+    version_dir = os.path.join(model_root, version)
+    os.makedirs(version_dir, exist_ok=True)
+    with open(os.path.join(version_dir, 'model.pkl'), 'wb') as file:
+        pickle.dump(model, file)
+    with open(os.path.join(version_dir, 'vectorizer.pkl'), 'wb') as file:
+        pickle.dump(vectorizer, file)
+    LinearScorer.from_estimator(model, vectorizer).save(os.path.join(version_dir, 'scorer'))
+    return version_dir
+
+def make_reviews(corpus: list, n_words: int, count: int) -> list:
+    """Build `count` distinct reviews of exactly n_words words from the corpus."""
+    words = " ".join(corpus).split()
+    reviews = []
+    for i in range(count):
+        start = (i * 7919) % max(len(words) - n_words, 1)
+        review = words[start:start + n_words]
+        review += words[:n_words - len(review)]
+        reviews.append(" ".join(review[:n_words - 1] + [f"take{i}"]))
+    return reviews
+
+def summarize(latencies: list, elapsed: float) -> dict:
+    latencies = np.asarray(latencies) * 1000
+    return {"calls": len(latencies), "throughput_per_second": len(latencies) / elapsed,
+            "mean_ms": float(latencies.mean()),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "p99_ms": float(np.percentile(latencies, 99))}
+
+def time_calls(func, inputs: list, concurrency: int) -> dict:
+    """Call func on every input from `concurrency` threads and summarise the latencies."""
+    def timed(item):
+        start = time.perf_counter()
+        func(item)
+        return time.perf_counter() - start
+
+    func(inputs[0])  # warm-up
+    start = time.perf_counter()
+    if concurrency == 1:
+        latencies = [timed(item) for item in inputs]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(timed, inputs))
+    return summarize(latencies, time.perf_counter() - start)
+
+def run_benchmarks(model_root: str, corpus: list, lengths: list, concurrency_levels: list,
+                   n_calls: int, backend: str = "sklearn") -> list:
+    """Time every stage for each (length, concurrency) pair and return one record per run."""
+    from flask_app.app import create_app
+
+    model_store = ModelStore(LocalModelSource(model_root, backend=backend))
+    client = create_app(model_store=model_store, start_watcher=False).test_client()
+    bundle = model_store.current
+
+    def route(review):
+        response = client.post('/predict', data={"text": review})
+        if response.status_code != 200:
+            raise RuntimeError(f"/predict returned {response.status_code}")
+
+    results = []
+    for n_words in lengths:
+        reviews = make_reviews(corpus, n_words, n_calls)
+        texts = [normalize_text(review) for review in reviews]
+        features = [bundle.vectorizer.transform([text]) for text in texts]
+        stage_inputs = {"normalize": (normalize_text, reviews),
+                        "transform": (lambda text: bundle.vectorizer.transform([text]), texts),
+                        "predict": (bundle.model.predict, features),
+                        "route": (route, reviews)}
+        for concurrency in concurrency_levels:
+            for stage in STAGES:
+                func, inputs = stage_inputs[stage]
+                record = {"stage": stage, "review_words": n_words, "concurrency": concurrency}
+                record.update(time_calls(func, inputs, concurrency))
+                results.append(record)
+                print(f"{stage:>9} words={n_words:<5} threads={concurrency:<3} "
+                      f"p50={record['p50_ms']:.3f}ms p95={record['p95_ms']:.3f}ms p99={record['p99_ms']:.3f}ms "
+                      f"{record['throughput_per_second']:.0f}/s")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="notebooks/data.csv", help="CSV with review and sentiment columns")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[20, 200, 1000], help="Review lengths in words")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--calls", type=int, default=500, help="Calls per stage, length and concurrency")
+    parser.add_argument("--max-features", type=int, default=50)
+    parser.add_argument("--backend", choices=["sklearn", "numpy"], default="sklearn")
+    parser.add_argument("--output", default="reports/benchmarks/serving_latency.json")
+    args = parser.parse_args()
+
+    # inputs are distinct per call anyway; without the prediction cache no lookup overhead is timed either
+    os.environ.setdefault("PREDICTION_CACHE_SIZE", "0")
+    corpus = pd.read_csv(args.data)['review'].tolist()
+    with tempfile.TemporaryDirectory() as model_root:
+        train_local_model(args.data, model_root, args.max_features)
+        results = run_benchmarks(model_root, corpus, args.lengths, args.concurrency, args.calls, args.backend)
+
+    report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0],
+              "platform": platform.platform(), "cpu_count": os.cpu_count(), "backend": args.backend,
+              "max_features": args.max_features, "results": results}
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=4)
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare request throughput of running servers, e.g. the gunicorn/Flask and uvicorn/ASGI
+entry points started side by side from flask_app/:
+
+    gunicorn --config gunicorn.conf.py --bind 0.0.0.0:5000 app:app
+    uvicorn asgi:app --port 5001
+    python benchmarks/serving_throughput.py http://localhost:5000 http://localhost:5001 --concurrency 64
+"""
+import json
+import time
+import argparse
+import urllib.parse
+import urllib.request
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+REVIEW = ("The plot was thin but the performances carried it; I would happily watch it again "
+          "with friends on a slow evening. ")
+
+def post_review(url: str, data: bytes) -> float:
+    start = time.perf_counter()
+    with urllib.request.urlopen(urllib.request.Request(url, data=data, method="POST"), timeout=120) as response:
+        response.read()
+    return time.perf_counter() - start
+
+def run(base_url: str, n_requests: int, concurrency: int, review_words: int) -> dict:
+    """Send n_requests /predict posts with the given concurrency and summarise the latencies."""
+    words = (REVIEW * (review_words // len(REVIEW.split()) + 1)).split()[:review_words]
+    # a distinct suffix per request keeps the prediction cache from answering everything
+    bodies = [urllib.parse.urlencode({"text": " ".join(words) + f" take {i}"}).encode() for i in range(n_requests)]
+    url = base_url.rstrip("/") + "/predict"
+
+    post_review(url, bodies[0])  # warm-up
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = np.array(list(executor.map(lambda body: post_review(url, body), bodies)))
+    elapsed = time.perf_counter() - start
+
+    return {"url": base_url, "requests": n_requests, "concurrency": concurrency, "review_words": review_words,
+            "requests_per_second": n_requests / elapsed,
+            "p50_ms": float(np.percentile(latencies, 50) * 1000),
+            "p95_ms": float(np.percentile(latencies, 95) * 1000),
+            "p99_ms": float(np.percentile(latencies, 99) * 1000)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("urls", nargs="+", help="Base URLs of the servers to compare")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--review-words", type=int, default=200)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = [run(url, args.requests, args.concurrency, args.review_words) for url in args.urls]
+    for result in results:
+        print(f"{result['url']}: {result['requests_per_second']:.1f} req/s, "
+              f"p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=4)
+
+if __name__ == "__main__":
+    main()
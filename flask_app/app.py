@@ -1,98 +1,20 @@
-from flask import Flask, render_template, request
-import mlflow
-import pickle
+from flask import Blueprint, Flask, current_app, render_template, request, jsonify
 import os
-import pandas as pd
 import numpy as np
-from prometheus_client import Counter, Histogram, generate_latest, CollectorRegistry, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CollectorRegistry, CONTENT_TYPE_LATEST
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+import hmac
 import time
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import stopwords
-import string
-import re
-import dagshub
+import weakref
+from src.connections.dagshub_connection import configure_mlflow_tracking
+from src.text import default_normalizer, normalize_text
+from src.serving import (ArtifactCache, LocalModelSource, LRUCache, MicroBatcher, ModelStore, PredictionCache,
+                         RegistryModelSource, SamplingProfiler)
 
 import warnings
 warnings.simplefilter("ignore", UserWarning)
 warnings.filterwarnings("ignore")
 
-def lemmatization(text):
-    """Lemmatize the text."""
-    lemmatizer = WordNetLemmatizer()
-    text = text.split()
-    text = [lemmatizer.lemmatize(word) for word in text]
-    return " ".join(text)
-
-def remove_stop_words(text):
-    """Remove stop words from the text."""
-    stop_words = set(stopwords.words("english"))
-    text = [word for word in str(text).split() if word not in stop_words]
-    return " ".join(text)
-
-def removing_numbers(text):
-    """Remove numbers from the text."""
-    text = ''.join([char for char in text if not char.isdigit()])
-    return text
-
-def lower_case(text):
-    """Convert text to lower case."""
-    text = text.split()
-    text = [word.lower() for word in text]
-    return " ".join(text)
-
-def removing_punctuations(text):
-    """Remove punctuations from the text."""
-    text = re.sub('[%s]' % re.escape(string.punctuation), ' ', text)
-    text = text.replace('؛', "")
-    text = re.sub('\s+', ' ', text).strip()
-    return text
-
-def removing_urls(text):
-    """Remove URLs from the text."""
-    url_pattern = re.compile(r'https?://\S+|www\.\S+')
-    return url_pattern.sub(r'', text)
-
-def remove_small_sentences(df):
-    """Remove sentences with less than 3 words."""
-    for i in range(len(df)):
-        if len(df.text.iloc[i].split()) < 3:
-            df.text.iloc[i] = np.nan
-
-def normalize_text(text):
-    text = lower_case(text)
-    text = remove_stop_words(text)
-    text = removing_numbers(text)
-    text = removing_punctuations(text)
-    text = removing_urls(text)
-    text = lemmatization(text)
-
-    return text
-
-# Below is the code for production use
-# -------------------------------------------------------------------------------------
-# Set up DagsHub credentials for MLflow tracking
-dagshub_token = os.getenv("CAPSTONE_TEST")
-if not dagshub_token:
-    raise EnvironmentError("CAPSTONE_TEST environment variable is not set")
-
-os.environ["MLFLOW_TRACKING_USERNAME"] = dagshub_token
-os.environ["MLFLOW_TRACKING_PASSWORD"] = dagshub_token
-
-dagshub_url = "https://dagshub.com"
-repo_owner = "keshav1017"
-repo_name = "Capstone-Project"
-
-# Set up MLflow tracking URI
-mlflow.set_tracking_uri(f'{dagshub_url}/{repo_owner}/{repo_name}.mlflow')
-
-# below code is for local use
-
-# mlflow.set_tracking_uri('https://dagshub.com/keshav1017/Capstone-Project.mlflow')
-# dagshub.init(repo_owner='keshav1017', repo_name='Capstone-Project', mlflow=True)
-
-# Initialize flask app
-app = Flask(__name__)
-
 # Create a custom registry
 registry = CollectorRegistry()
 
@@ -106,57 +28,337 @@ REQUEST_LATENCY = Histogram(
 PREDICTION_COUNT = Counter(
     "model_prediction_count", "Count of prediction for each class", ["prediction"], registry=registry
 )
+# one observation per call: a batch (or micro-batch) is normalized, vectorized and predicted in one call
+STAGE_LATENCY = Histogram(
+    "predict_stage_latency_seconds", "Time spent in each stage of a prediction", ["stage"], registry=registry,
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+)
+REVIEW_CHARS = Histogram(
+    "review_length_chars", "Characters per submitted review", registry=registry,
+    buckets=(50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000)
+)
+REVIEW_TOKENS = Histogram(
+    "review_length_tokens", "Tokens per review after normalization", registry=registry,
+    buckets=(5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+)
+
+class LemmaCacheCollector:
+    """Expose the lemma cache statistics of the shared text normalizer."""
+    def collect(self):
+        info = default_normalizer().lemma_cache_info()
+        yield CounterMetricFamily("lemma_cache_hits", "Lemma lookups served from the cache", value=info.hits)
+        yield CounterMetricFamily("lemma_cache_misses", "Lemma lookups that went to WordNet", value=info.misses)
+        yield GaugeMetricFamily("lemma_cache_size", "Number of lemmas currently cached", value=info.currsize)
+
+registry.register(LemmaCacheCollector())
+
+class PredictionCacheCollector:
+    """Expose the counters of every live prediction cache in this process."""
+    def __init__(self):
+        self.caches = weakref.WeakSet()
+
+    def collect(self):
+        caches = list(self.caches)
+        yield CounterMetricFamily("prediction_cache_hits", "Predictions served from the cache",
+                                  value=sum(cache.hits for cache in caches))
+        yield CounterMetricFamily("prediction_cache_misses", "Predictions that had to be scored",
+                                  value=sum(cache.misses for cache in caches))
+        yield CounterMetricFamily("prediction_cache_evictions", "Entries dropped to stay within the size limit",
+                                  value=sum(cache.evictions for cache in caches))
+        yield CounterMetricFamily("prediction_cache_expirations", "Entries dropped after their TTL ran out",
+                                  value=sum(cache.expirations for cache in caches))
+        yield GaugeMetricFamily("prediction_cache_size", "Number of predictions currently cached",
+                                value=sum(len(cache) for cache in caches))
+
+PREDICTION_CACHE_METRICS = PredictionCacheCollector()
+registry.register(PREDICTION_CACHE_METRICS)
+
+BATCH_SIZE = Histogram(
+    "predict_micro_batch_size", "Number of reviews scored together by the micro-batcher", registry=registry,
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+QUEUE_WAIT = Histogram(
+    "predict_queue_wait_seconds", "Time a review waited in the micro-batch queue", registry=registry,
+    buckets=(0.0005, 0.001, 0.002, 0.003, 0.005, 0.0075, 0.01, 0.025, 0.05, 0.1)
+)
+MODEL_VERSION = Gauge(
+    "model_active_version", "Version of the model currently serving requests", registry=registry
+)
+MODEL_RELOAD_COUNT = Counter(
+    "model_reload_count", "Model reload attempts by the background watcher", ["result"], registry=registry
+)
 
 # Model and vectorizer setup
 model_name = "my_model"
-def get_latest_model_version(model_name):
-    client = mlflow.MlflowClient()
-    latest_version = client.get_latest_versions(model_name, stages=["Production"])
-    if not latest_version:
-        latest_version = client.get_latest_versions(model_name, stages=["None"])
-    return latest_version[0].version if latest_version else None
-
-model_version = get_latest_model_version(model_name)
-model_uri = f'models:/{model_name}/{model_version}'
-print(f"Fetching model from: {model_uri}")
-model = mlflow.pyfunc.load_model(model_uri)
-vectorizer = pickle.load(open('models/vectorizer.pkl', 'rb'))
+
+def on_model_swap(bundle, previous):
+    """Publish the version that just went live; the initial load is not a reload."""
+    if previous is not None:
+        MODEL_RELOAD_COUNT.labels(result="success").inc()
+    if bundle.version.isdigit():
+        MODEL_VERSION.set(int(bundle.version))
+
+def build_model_store() -> ModelStore:
+    """
+    Create the model store selected by MODEL_SOURCE. Nothing is loaded here: the store
+    fetches the version to serve on first use, and tracking is configured only then.
+    """
+    vectorizer_mode = os.getenv("VECTORIZER_MODE", "bow")
+    # "numpy" serves the exported LinearScorer instead of the scikit-learn estimator
+    backend = os.getenv("SCORER_BACKEND", "sklearn")
+    if os.getenv("MODEL_SOURCE", "registry") == "local":
+        model_source = LocalModelSource(os.getenv("LOCAL_MODEL_DIR", "models/versions"), vectorizer_mode, backend)
+    else:
+        # workers on the same host share one download per model version through the cache
+        cache_dir = os.getenv("MODEL_CACHE_DIR", os.path.expanduser("~/.cache/imdb-sentiment/models"))
+        model_source = RegistryModelSource(model_name, 'models/vectorizer.pkl', vectorizer_mode,
+                                           cache=ArtifactCache(cache_dir) if cache_dir else None, backend=backend,
+                                           setup=configure_mlflow_tracking)
+
+    return ModelStore(model_source)
+
+def start_model_watcher(model_store: ModelStore) -> None:
+    """
+    Poll for newer versions and swap them in atomically, so picking up a promoted model
+    needs no restart. Under gunicorn --preload this runs in each worker after the fork.
+    """
+    model_store.start_watcher(float(os.getenv("MODEL_POLL_INTERVAL", "60")),
+                              on_error=lambda e: MODEL_RELOAD_COUNT.labels(result="failure").inc())
+
+# Upper bound on the number of reviews accepted by a single batch request
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "10000"))
+
+def score_texts(model_store: ModelStore, texts: list) -> list:
+    """
+    Vectorize and score already-normalized texts with one call each.
+
+    :return: A (label, positive-class probability) pair per text; labels and
+        probabilities come from the same pass over the sparse matrix.
+    """
+    # one read of the active bundle keeps model and vectorizer consistent for this call
+    bundle = model_store.current
+    with STAGE_LATENCY.labels(stage="vectorize").time():
+        features = bundle.vectorizer.transform(texts)
+    with STAGE_LATENCY.labels(stage="predict").time():
+        proba = bundle.model.predict_proba(features)
+    labels = bundle.model.classes_[proba.argmax(axis=1)]
+    return list(zip(labels.tolist(), proba[:, -1].tolist()))
+
+def build_prediction_cache(model_store: ModelStore) -> PredictionCache:
+    """
+    Cache predictions per normalized text and model version. PREDICTION_CACHE_SIZE=0
+    disables it; PREDICTION_CACHE_TTL=0 keeps entries until they are evicted.
+    """
+    size = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+    if size <= 0:
+        return None
+    local = LRUCache(size, ttl=float(os.getenv("PREDICTION_CACHE_TTL", "3600")))
+    PREDICTION_CACHE_METRICS.caches.add(local)
+    cache = PredictionCache(local)
+    # entries of the old version can never be hit again, so free them right away
+    model_store.add_listener(lambda bundle, previous: cache.invalidate())
+    return cache
+
+def cached_scores(model_store: ModelStore, cache: PredictionCache, texts: list, score) -> list:
+    """Return score(texts) with cached results filled in, calling score on the misses only."""
+    if cache is None:
+        return score(texts)
+    version = model_store.current.version
+    results = [cache.get(text, version) for text in texts]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        for i, result in zip(missing, score([texts[i] for i in missing])):
+            cache.set(texts[i], version, result)
+            results[i] = result
+    return results
+
+def observe_micro_batch(size: int, waits: list) -> None:
+    BATCH_SIZE.observe(size)
+    for wait in waits:
+        QUEUE_WAIT.observe(wait)
+
+def build_micro_batcher(model_store: ModelStore) -> MicroBatcher:
+    """
+    Optional micro-batching of /predict: with MICRO_BATCH_WINDOW_MS > 0, concurrent
+    requests in the same worker share one vectorize and one predict call. It only pays
+    off with several request threads per worker (GUNICORN_THREADS).
+    """
+    window_ms = float(os.getenv("MICRO_BATCH_WINDOW_MS", "0"))
+    if window_ms <= 0:
+        return None
+    return MicroBatcher(lambda texts: score_texts(model_store, texts),
+                        max_batch_size=int(os.getenv("MICRO_BATCH_MAX_SIZE", "64")),
+                        max_wait=window_ms / 1000, on_batch=observe_micro_batch)
+
+def normalize_reviews(reviews: list) -> list:
+    """Normalize raw reviews, recording their sizes and the time spent."""
+    with STAGE_LATENCY.labels(stage="normalize").time():
+        texts = [normalize_text(review) for review in reviews]
+    for review, text in zip(reviews, texts):
+        REVIEW_CHARS.observe(len(review))
+        REVIEW_TOKENS.observe(len(text.split()))
+    return texts
+
+def predict_review(extensions: dict, text: str):
+    """
+    Normalize and score one review through the prediction cache and, when enabled, the
+    micro-batcher. Shared by the Flask and ASGI front ends.
+
+    :param extensions: The serving objects built by create_app (app.extensions).
+    """
+    text, = normalize_reviews([text])
+
+    model_store = extensions["model_store"]
+    batcher = extensions["micro_batcher"]
+    if batcher is not None:
+        score = lambda texts: [batcher.submit(text).result() for text in texts]
+    else:
+        score = lambda texts: score_texts(model_store, texts)
+    prediction, _ = cached_scores(model_store, extensions["prediction_cache"], [text], score)[0]
+
+    # Increment prediction count
+    PREDICTION_COUNT.labels(prediction=str(prediction)).inc()
+    return prediction
+
+def batch_payload_error(payload):
+    """Return an (error message, status) pair for an invalid batch body, or None."""
+    reviews = payload.get("reviews") if isinstance(payload, dict) else None
+    if not isinstance(reviews, list) or not all(isinstance(review, str) for review in reviews):
+        return "Request body must be a JSON object with a 'reviews' list of strings.", 400
+    if len(reviews) > MAX_BATCH_SIZE:
+        return f"A batch may contain at most {MAX_BATCH_SIZE} reviews.", 413
+    return None
+
+def predict_reviews(extensions: dict, reviews: list) -> tuple:
+    """Score a list of reviews with one vectorizer and one model call; returns (labels, probabilities)."""
+    model_store = extensions["model_store"]
+    labels, probabilities = [], []
+    if reviews:
+        texts = normalize_reviews(reviews)
+        # only the reviews missing from the cache go through one vectorize and one predict call
+        results = cached_scores(model_store, extensions["prediction_cache"], texts,
+                                lambda misses: score_texts(model_store, misses))
+        labels = [label for label, _ in results]
+        probabilities = [probability for _, probability in results]
+
+        for prediction, count in zip(*np.unique(labels, return_counts=True)):
+            PREDICTION_COUNT.labels(prediction=str(prediction)).inc(int(count))
+    return labels, probabilities
+
+bp = Blueprint("sentiment", __name__)
 
 # Routes
-@app.route("/")
+@bp.route("/")
 def home():
     REQUEST_COUNT.labels(method="GET", endpoint="/").inc()
     start_time = time.time()
-    response = render_template("index.html", result=None)
+    with STAGE_LATENCY.labels(stage="render").time():
+        response = render_template("index.html", result=None)
     REQUEST_LATENCY.labels(endpoint="/").observe(time.time() - start_time)
     return response
 
-@app.route("/predict", methods=["POST"])
+@bp.route("/predict", methods=["POST"])
 def predict():
     REQUEST_COUNT.labels(method="POST", endpoint="/predict").inc()
     start_time = time.time()
 
     text = request.form["text"]
-    text = normalize_text(text)
-    features = vectorizer.transform([text])
-    features_df = pd.DataFrame(features.toarray(), columns=[str(i) for i in range(features.shape[1])])
-
-    # predict
-    result = model.predict(features_df)
-    prediction = result[0]
+    prediction = predict_review(current_app.extensions, text)
 
-    # Increment prediction count latency
-    PREDICTION_COUNT.labels(prediction=str(prediction)).inc()
+    with STAGE_LATENCY.labels(stage="render").time():
+        response = render_template("index.html", result=prediction)
 
     # Measure latency
     REQUEST_LATENCY.labels(endpoint="/predict").observe(time.time() - start_time)
 
-    return render_template("index.html", result=prediction) 
+    return response
+
+@bp.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    """Score a JSON list of reviews with one vectorizer and one model call."""
+    REQUEST_COUNT.labels(method="POST", endpoint="/predict/batch").inc()
+    start_time = time.time()
+
+    payload = request.get_json(silent=True)
+    error = batch_payload_error(payload)
+    if error is not None:
+        message, status = error
+        return jsonify(error=message), status
+
+    labels, probabilities = predict_reviews(current_app.extensions, payload["reviews"])
+
+    REQUEST_LATENCY.labels(endpoint="/predict/batch").observe(time.time() - start_time)
+
+    return jsonify(labels=labels, probabilities=probabilities)
+
+PROFILER = SamplingProfiler(interval=float(os.getenv("PROFILER_INTERVAL_MS", "5")) / 1000)
+# Longest profile a single request may ask for
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+
+def profile_request(method: str, token: str, seconds: str = None) -> tuple:
+    """
+    Admin control of the sampling profiler, shared by the Flask and ASGI front ends.
 
-@app.route("/metrics", methods=["GET"])
+    Disabled (404) unless ADMIN_TOKEN is set; the caller must send it back as the
+    X-Admin-Token header. POST starts a capture of `seconds` (default 10) in the
+    background; GET returns the folded stacks of the last finished capture.
+
+    :return: A (body, status) pair.
+    """
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        return "Not Found", 404
+    if not hmac.compare_digest((token or "").encode("utf-8"), admin_token.encode("utf-8")):
+        return "Forbidden", 403
+    if method == "POST":
+        try:
+            duration = float(seconds or 10)
+        except ValueError:
+            return "seconds must be a number", 400
+        if not 0 < duration <= PROFILER_MAX_SECONDS:
+            return f"seconds must be in (0, {PROFILER_MAX_SECONDS:g}]", 400
+        if not PROFILER.start(duration):
+            return "A profile is already being captured", 409
+        return f"Profiling process {os.getpid()} for {duration:g} seconds", 202
+    if PROFILER.running:
+        return "A profile is still being captured", 202
+    return PROFILER.folded(), 200
+
+@bp.route("/admin/profile", methods=["GET", "POST"])
+def admin_profile():
+    body, status = profile_request(request.method, request.headers.get("X-Admin-Token"), request.args.get("seconds"))
+    return body, status, {"Content-Type": "text/plain; charset=utf-8"}
+
+@bp.route("/metrics", methods=["GET"])
 def metrics():
     """Expose only custom Prometheus metrics."""
     return generate_latest(registry), 200, {"Content-Type": CONTENT_TYPE_LATEST}
 
+def create_app(model_store: ModelStore = None, start_watcher: bool = False) -> Flask:
+    """
+    Build the Flask app around a model store.
+
+    :param model_store: Store to serve from; built from the environment when omitted.
+    :param start_watcher: Start the background model watcher in this process. Off by
+        default so importing the app starts no threads; the servers start it once they
+        serve (`python app.py`, gunicorn's post_fork and the ASGI lifespan startup).
+    """
+    app = Flask(__name__)
+    model_store = model_store or build_model_store()
+    # registered here so stores passed in by tests and benchmarks publish the same metrics
+    model_store.add_listener(on_model_swap)
+    app.extensions["model_store"] = model_store
+    app.extensions["micro_batcher"] = build_micro_batcher(model_store)
+    app.extensions["prediction_cache"] = build_prediction_cache(model_store)
+    app.register_blueprint(bp)
+    if start_watcher:
+        start_model_watcher(model_store)
+    return app
+
+app = create_app(start_watcher=os.getenv("MODEL_WATCHER_AUTOSTART", "0") == "1")
+
 if __name__ == "__main__":
+    # fail at startup, not on the first request, if no model can be loaded
+    app.extensions["model_store"].current
+    start_model_watcher(app.extensions["model_store"])
     app.run(host="0.0.0.0", port=5000) # for local use
\ No newline at end of file
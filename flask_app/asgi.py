@@ -0,0 +1,160 @@
+"""
+Async entry point serving the same routes as the Flask app:
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 2
+
+The event loop only does connection handling; normalization and scoring run on a
+bounded thread pool, so slow clients no longer hold a worker the way gunicorn sync
+workers do. Model store, prediction cache, micro-batcher and Prometheus registry are
+the ones built for the Flask app, so /metrics reports identical series.
+"""
+import os
+import time
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+if __package__:
+    from .app import (app as flask_app, registry, batch_payload_error, predict_review, predict_reviews,
+                      profile_request, start_model_watcher, REQUEST_COUNT, REQUEST_LATENCY, STAGE_LATENCY)
+else:
+    from app import (app as flask_app, registry, batch_payload_error, predict_review, predict_reviews,
+                     profile_request, start_model_watcher, REQUEST_COUNT, REQUEST_LATENCY, STAGE_LATENCY)
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+
+class SentimentASGI:
+    """
+    Minimal ASGI application for /, /predict, /predict/batch, /metrics and /admin/profile.
+
+    :param extensions: Serving objects built by create_app (Flask app.extensions).
+    :param jinja_env: Environment used to render index.html.
+    :param max_workers: Threads available for CPU-bound work.
+    :param max_pending: Requests allowed to wait for or hold a scoring thread; further
+        requests wait on the event loop instead of growing the executor queue.
+    """
+    def __init__(self, extensions: dict, jinja_env, max_workers: int = 4, max_pending: int = 256):
+        self.extensions = extensions
+        self.template = jinja_env.get_template("index.html")
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._slots = None
+
+    async def run(self, func, *args):
+        """Run a blocking call on the bounded executor."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="asgi-score")
+            self._slots = asyncio.Semaphore(self.max_pending)
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        route = (scope["method"], scope["path"])
+        if route == ("GET", "/"):
+            await self.home(send)
+        elif route == ("POST", "/predict"):
+            await self.predict(receive, send)
+        elif route == ("POST", "/predict/batch"):
+            await self.predict_batch(receive, send)
+        elif route == ("GET", "/metrics"):
+            await respond(send, 200, generate_latest(registry), CONTENT_TYPE_LATEST)
+        elif scope["path"] == "/admin/profile" and scope["method"] in ("GET", "POST"):
+            await self.admin_profile(scope, send)
+        else:
+            await respond(send, 404, b"Not Found", "text/plain")
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                # load the model before accepting traffic, so a missing registry fails startup
+                try:
+                    await asyncio.get_running_loop().run_in_executor(
+                        None, lambda: self.extensions["model_store"].current)
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                # each uvicorn worker process polls for new versions on its own
+                start_model_watcher(self.extensions["model_store"])
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.extensions["model_store"].stop_watcher()
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def home(self, send):
+        REQUEST_COUNT.labels(method="GET", endpoint="/").inc()
+        start_time = time.time()
+        with STAGE_LATENCY.labels(stage="render").time():
+            body = self.template.render(result=None).encode("utf-8")
+        REQUEST_LATENCY.labels(endpoint="/").observe(time.time() - start_time)
+        await respond(send, 200, body, "text/html; charset=utf-8")
+
+    async def predict(self, receive, send):
+        REQUEST_COUNT.labels(method="POST", endpoint="/predict").inc()
+        start_time = time.time()
+
+        form = parse_qs((await read_body(receive)).decode("utf-8"), keep_blank_values=True)
+        if "text" not in form:
+            await respond(send, 400, b"Missing form field 'text'.", "text/plain")
+            return
+        prediction = await self.run(predict_review, self.extensions, form["text"][0])
+        with STAGE_LATENCY.labels(stage="render").time():
+            body = self.template.render(result=prediction).encode("utf-8")
+
+        REQUEST_LATENCY.labels(endpoint="/predict").observe(time.time() - start_time)
+        await respond(send, 200, body, "text/html; charset=utf-8")
+
+    async def predict_batch(self, receive, send):
+        REQUEST_COUNT.labels(method="POST", endpoint="/predict/batch").inc()
+        start_time = time.time()
+
+        try:
+            payload = json.loads(await read_body(receive))
+        except ValueError:
+            payload = None
+        error = batch_payload_error(payload)
+        if error is not None:
+            message, status = error
+            await respond(send, status, json.dumps({"error": message}).encode("utf-8"), "application/json")
+            return
+
+        labels, probabilities = await self.run(predict_reviews, self.extensions, payload["reviews"])
+
+        REQUEST_LATENCY.labels(endpoint="/predict/batch").observe(time.time() - start_time)
+        body = json.dumps({"labels": labels, "probabilities": probabilities}).encode("utf-8")
+        await respond(send, 200, body, "application/json")
+
+    async def admin_profile(self, scope, send):
+        headers = dict(scope.get("headers", []))
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        body, status = profile_request(scope["method"], headers.get(b"x-admin-token", b"").decode("latin-1"),
+                                       query.get("seconds", [None])[0])
+        await respond(send, status, body.encode("utf-8"), "text/plain; charset=utf-8")
+
+async def read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+async def respond(send, status: int, body: bytes, content_type: str) -> None:
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", content_type.encode("latin-1")),
+                            (b"content-length", str(len(body)).encode("latin-1"))]})
+    await send({"type": "http.response.body", "body": body})
+
+app = SentimentASGI(flask_app.extensions, flask_app.jinja_env,
+                    max_workers=int(os.getenv("ASGI_SCORING_THREADS", "4")),
+                    max_pending=int(os.getenv("ASGI_MAX_PENDING", "256")))
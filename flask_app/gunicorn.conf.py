@@ -0,0 +1,28 @@
+# Gunicorn settings for the production image.
+#
+# The app (model, vectorizer and NLTK corpora) is loaded once in the master and the
+# workers are forked from it, so they share those pages copy-on-write instead of each
+# holding a private copy.
+import gc
+import os
+
+bind = "0.0.0.0:5000"
+timeout = 120
+workers = int(os.getenv("GUNICORN_WORKERS", "1"))
+# more than one thread switches to the gthread worker, which micro-batching needs
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+preload_app = True
+
+def when_ready(server):
+    """Load the model and warm the shared corpora in the master, then freeze the heap before forking."""
+    from src.text import default_normalizer
+    # the app loads its model lazily; do it here so every worker inherits the loaded bundle
+    server.app.wsgi().extensions["model_store"].current
+    default_normalizer().tokens("warming up the shared stop words and wordnet corpora")
+    # keep the cyclic GC from touching (and so copying) the preloaded objects in workers
+    gc.freeze()
+
+def post_fork(server, worker):
+    """Threads do not survive fork, so each worker starts its own model watcher."""
+    from app import start_model_watcher
+    start_model_watcher(server.app.wsgi().extensions["model_store"])
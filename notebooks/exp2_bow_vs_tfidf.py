@@ -1,7 +1,5 @@
 import setuptools
 import os
-import re
-import string
 import pandas as pd
 pd.set_option('future.no_silent_downcasting', True)
 
@@ -9,16 +7,9 @@ import numpy as np
 import mlflow
 import mlflow.sklearn
 import dagshub
-from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
-from sklearn.naive_bayes import MultinomialNB
-from xgboost import XGBClassifier
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-import scipy.sparse
+from src.experiments import (ResourceLimits, build_feature_sets, default_algorithms, default_vectorizers,
+                             log_results, run_grid)
+from src.text import normalize_text as normalize_review
 
 import warnings
 warnings.simplefilter("ignore", UserWarning)
@@ -31,7 +22,11 @@ CONFIG = {
     "mlflow_tracking_uri": "https://dagshub.com/keshav1017/Capstone-Project.mlflow",
     "dagshub_repo_owner": "keshav1017",
     "dagshub_repo_name": "Capstone-Project",
-    "experiment_name": "Bow vs TfIdf"
+    "experiment_name": "Bow vs TfIdf",
+    "cache_dir": ".cache/experiments",
+    "max_workers": None,  # one job per CPU
+    "cpu_seconds_per_job": 1800,
+    "memory_mb_per_job": None
 }
 
 # ========================== SETUP MLflow & DAGSHUB ==========================
@@ -40,34 +35,9 @@ dagshub.init(repo_owner=CONFIG["dagshub_repo_owner"], repo_name=CONFIG["dagshub_
 mlflow.set_experiment(CONFIG["experiment_name"])
 
 # ========================== TEXT PREPROCESSING ==========================
-def lemmatization(text):
-    lemmatizer = WordNetLemmatizer()
-    return " ".join([lemmatizer.lemmatize(word) for word in text.split()])
-
-def remove_stop_words(text):
-    stop_words = set(stopwords.words("english"))
-    return " ".join([word for word in text.split() if word not in stop_words])
-
-def removing_numbers(text):
-    return ''.join([char for char in text if not char.isdigit()])
-
-def lower_case(text):
-    return text.lower()
-
-def removing_punctuations(text):
-    return re.sub(f"[{re.escape(string.punctuation)}]", ' ', text)
-
-def removing_urls(text):
-    return re.sub(r'https?://\S+|www\.\S+', '', text)
-
 def normalize_text(df):
     try:
-        df['review'] = df['review'].apply(lower_case)
-        df['review'] = df['review'].apply(remove_stop_words)
-        df['review'] = df['review'].apply(removing_numbers)
-        df['review'] = df['review'].apply(removing_punctuations)
-        df['review'] = df['review'].apply(removing_urls)
-        df['review'] = df['review'].apply(lemmatization)
+        df['review'] = df['review'].apply(normalize_review)
         return df
     except Exception as e:
         print(f"Error during text normalization: {e}")
@@ -86,84 +56,29 @@ def load_data(file_path):
         raise
 
 # ========================== FEATURE ENGINEERING ==========================
-VECTORIZERS = {
-    'BoW': CountVectorizer(),
-    'TF-IDF': TfidfVectorizer()
-}
+# Each vectorizer is fitted once and its train/test matrices are cached on disk
+VECTORIZERS = default_vectorizers()
 
-ALGORITHMS = {
-    'LogisticRegression': LogisticRegression(),
-    'MultinomialNB': MultinomialNB(),
-    'XGBoost': XGBClassifier(),
-    'RandomForest': RandomForestClassifier(),
-    'GradientBoosting': GradientBoostingClassifier()
-}
+# XGBoost is included when it is installed
+ALGORITHMS = default_algorithms()
 
 # ============================= TRAIN AND EVALUATE MODELS =================================
 
 def train_and_evaluate(df):
-    with mlflow.start_run(run_name="All Experiments") as parent_run:
-        for algo_name, algorithm in ALGORITHMS.items():
-            for vec_name, vectorizer in VECTORIZERS.items():
-                with mlflow.start_run(run_name=f"{algo_name} with {vec_name}", nested=True) as child_run:
-                    try:
-                        # feature extraction
-                        X = vectorizer.fit_transform(df['review'])
-                        y = df['sentiment']
-                        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=CONFIG["test_size"], random_state=42)
-
-                        # Log preprocessing parameters
-                        mlflow.log_params({
-                            "vectorizer": vec_name,
-                            "algorithm": algo_name,
-                            "test_size": CONFIG["test_size"]
-                        })
-
-                        # Train model
-                        model = algorithm
-                        model.fit(X_train, y_train)
-
-                        # Log model parameters
-                        log_model_params(algo_name, model)
-
-                        y_pred = model.predict(X_test)
-                        metrics = {
-                            "accuracy": accuracy_score(y_test, y_pred),
-                            "precision": precision_score(y_test, y_pred),
-                            "recall": recall_score(y_test, y_pred),
-                            "f1_score": f1_score(y_test, y_pred)
-                        }
-                        mlflow.log_metrics(metrics)
-
-                        # Print results for verification
-                        print(f"\nAlgorithm: {algo_name}, Vectorizer: {vec_name}")
-                        print(f"Metrics: {metrics}")
-
-                    except Exception as e:
-                        print(f"Error in training {algo_name} with {vec_name}: {e}")
-                        mlflow.log_param("error", str(e))
+    """Run the algorithm x vectorizer grid in parallel and log every job from this process."""
+    feature_sets = build_feature_sets(df['review'], df['sentiment'], VECTORIZERS, CONFIG["cache_dir"],
+                                      test_size=CONFIG["test_size"])
+    results = run_grid(ALGORITHMS, feature_sets, CONFIG["max_workers"],
+                       ResourceLimits(CONFIG["cpu_seconds_per_job"], CONFIG["memory_mb_per_job"]))
 
-def log_model_params(algo_name, model):
-    """Logs hyperparameters of the trained model to MLflow."""
-    params_to_log = {}
-    if algo_name == 'LogisticRegression':
-        params_to_log["C"] = model.C
-    elif algo_name == 'MultinomialNB':
-        params_to_log["alpha"] = model.alpha
-    elif algo_name == 'XGBoost':
-        params_to_log["n_estimators"] = model.n_estimators
-        params_to_log["learning_rate"] = model.learning_rate
-    elif algo_name == 'RandomForest':
-        params_to_log["n_estimators"] = model.n_estimators
-        params_to_log["max_depth"] = model.max_depth
-    elif algo_name == 'GradientBoosting':
-        params_to_log["n_estimators"] = model.n_estimators
-        params_to_log["learning_rate"] = model.learning_rate
-        params_to_log["max_depth"] = model.max_depth
+    # Print results for verification
+    for result in results:
+        print(f"\nAlgorithm: {result['algorithm']}, Vectorizer: {result['vectorizer']}")
+        print(f"Error: {result['error']}" if result['error'] else f"Metrics: {result['metrics']}")
 
-    mlflow.log_params(params_to_log)
+    log_results(results, CONFIG["experiment_name"], CONFIG["test_size"])
 
 # ========================== EXECUTION ==========================
 if __name__ == "__main__":
     df = load_data(CONFIG["data_path"])
-    train_and_evaluate(df)
\ No newline at end of file
+    train_and_evaluate(df)
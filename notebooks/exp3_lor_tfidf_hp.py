@@ -1,17 +1,11 @@
 import os
-import re
-import string
 import numpy as np
 import pandas as pd
 import mlflow
 import mlflow.sklearn
 import dagshub
-from sklearn.model_selection import train_test_split, GridSearchCV
-from sklearn.linear_model import LogisticRegression
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+from src.experiments import log_tuning_results, tune
+from src.text import normalize_text
 
 import warnings
 warnings.simplefilter("ignore", UserWarning)
@@ -26,51 +20,34 @@ dagshub.init(repo_owner="keshav1017", repo_name="Capstone-Project", mlflow=True)
 mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
 mlflow.set_experiment("LoR Hyperparameter Tuning")
 
-
-# ==========================
-# Text Preprocessing Functions
-# ==========================
-def preprocess_text(text):
-    """Applies multiple text preprocessing steps."""
-    lemmatizer = WordNetLemmatizer()
-    stop_words = set(stopwords.words("english"))
-
-    text = text.lower()  # Convert to lowercase
-    text = re.sub(r'\d+', '', text)  # Remove numbers
-    text = re.sub(f"[{re.escape(string.punctuation)}]", " ", text)  # Remove punctuation
-    text = re.sub(r'https?://\S+|www\.\S+', '', text)  # Remove URLs
-    text = " ".join([lemmatizer.lemmatize(word) for word in text.split() if word not in stop_words])  # Lemmatization & stopwords removal
-    
-    return text.strip()
+# "grid" scores every candidate; "halving" (successive halving) spends the full sample on the best ones only
+SEARCH = "grid"
+# per-fold TF-IDF matrices are cached here and shared by all candidates (and later runs)
+CACHE_DIR = ".cache/tuning"
 
 
 # ==========================
 # Load & Prepare Data
 # ==========================
 def load_and_prepare_data(filepath):
-    """Loads, preprocesses, and vectorizes the dataset."""
+    """Loads and preprocesses the dataset; TF-IDF is fitted per CV fold inside the search."""
     df = pd.read_csv(filepath)
     
     # Apply text preprocessing
-    df["review"] = df["review"].astype(str).apply(preprocess_text)
+    df["review"] = df["review"].astype(str).apply(normalize_text)
     
     # Filter for binary classification
     df = df[df["sentiment"].isin(["positive", "negative"])]
     df["sentiment"] = df["sentiment"].map({"negative": 0, "positive": 1})
     
-    # Convert text data to TF-IDF vectors
-    vectorizer = TfidfVectorizer()
-    X = vectorizer.fit_transform(df["review"])
-    y = df["sentiment"]
-    
-    return train_test_split(X, y, test_size=0.2, random_state=42), vectorizer
+    return df["review"], df["sentiment"]
 
 
 # ==========================
 # Train & Log Model
 # ==========================
-def train_and_log_model(X_train, X_test, y_train, y_test, vectorizer):
-    """Trains a Logistic Regression model with GridSearch and logs results to MLflow."""
+def train_and_log_model(texts, labels):
+    """Tunes Logistic Regression with GridSearch and logs results to MLflow without refitting candidates."""
     
     param_grid = {
         "C": [0.1, 1, 10],
@@ -78,51 +55,21 @@ def train_and_log_model(X_train, X_test, y_train, y_test, vectorizer):
         "solver": ["liblinear"]
     }
     
-    with mlflow.start_run():
-        grid_search = GridSearchCV(LogisticRegression(), param_grid, cv=5, scoring="f1", n_jobs=-1)
-        grid_search.fit(X_train, y_train)
-
-        # Log all hyperparameter tuning runs
-        for params, mean_score, std_score in zip(grid_search.cv_results_["params"], 
-                                                 grid_search.cv_results_["mean_test_score"], 
-                                                 grid_search.cv_results_["std_test_score"]):
-            with mlflow.start_run(run_name=f"LR with params: {params}", nested=True):
-                model = LogisticRegression(**params)
-                model.fit(X_train, y_train)
-                
-                y_pred = model.predict(X_test)
-                
-                
-                metrics = {
-                    "accuracy": accuracy_score(y_test, y_pred),
-                    "precision": precision_score(y_test, y_pred),
-                    "recall": recall_score(y_test, y_pred),
-                    "f1_score": f1_score(y_test, y_pred),
-                    "mean_cv_score": mean_score,
-                    "std_cv_score": std_score
-                }
-                
-                # Log parameters & metrics
-                mlflow.log_params(params)
-                mlflow.log_metrics(metrics)
-                
-                print(f"Params: {params} | Accuracy: {metrics['accuracy']:.4f} | F1: {metrics['f1_score']:.4f}")
+    result = tune(texts, labels, param_grid, cache_dir=CACHE_DIR, search=SEARCH, cv=5, test_size=0.2)
 
-        # Log the best model
-        best_params = grid_search.best_params_
-        best_model = grid_search.best_estimator_
-        best_f1 = grid_search.best_score_
+    # holdout metrics come from the fold models fitted during the search
+    for candidate in result.candidates:
+        holdout = candidate.get("holdout")
+        if holdout:
+            print(f"Params: {candidate['params']} | Accuracy: {holdout['accuracy']:.4f} | F1: {holdout['f1_score']:.4f}")
 
-        mlflow.log_params(best_params)
-        mlflow.log_metric("best_f1_score", best_f1)
-        mlflow.sklearn.log_model(best_model, "model")
-        
-        print(f"\nBest Params: {best_params} | Best F1 Score: {best_f1:.4f}")
+    log_tuning_results(result, "LoR Hyperparameter Tuning")
+    print(f"\nBest Params: {result.search.best_params_} | Best F1 Score: {result.search.best_score_:.4f}")
 
 
 # ==========================
 # Main Execution
 # ==========================
 if __name__ == "__main__":
-    (X_train, X_test, y_train, y_test), vectorizer = load_and_prepare_data("notebooks/data.csv")
-    train_and_log_model(X_train, X_test, y_train, y_test, vectorizer)
\ No newline at end of file
+    texts, labels = load_and_prepare_data("notebooks/data.csv")
+    train_and_log_model(texts, labels)
@@ -0,0 +1,42 @@
+import os
+
+DAGSHUB_URL = "https://dagshub.com"
+REPO_OWNER = "keshav1017"
+REPO_NAME = "Capstone-Project"
+DAGSHUB_TRACKING_URI = f"{DAGSHUB_URL}/{REPO_OWNER}/{REPO_NAME}.mlflow"
+
+_configured = False
+
+def configure_mlflow_tracking() -> str:
+    """
+    Point MLflow at the DagsHub tracking server, importing mlflow only now.
+
+    Called on first use by the pipeline stages and the serving app instead of at import
+    time. MLFLOW_TRACKING_URI overrides the DagsHub server (e.g. a local sqlite store);
+    otherwise the CAPSTONE_TEST token is required. Safe to call more than once.
+
+    :return: The tracking URI in use.
+    """
+    global _configured
+    tracking_uri = os.getenv("MLFLOW_TRACKING_URI", DAGSHUB_TRACKING_URI)
+    if _configured:
+        return tracking_uri
+
+    if tracking_uri == DAGSHUB_TRACKING_URI:
+        # Set up DagsHub credentials for MLflow tracking
+        dagshub_token = os.getenv("CAPSTONE_TEST")
+        if not dagshub_token:
+            raise EnvironmentError("CAPSTONE_TEST environment variable is not set")
+
+        os.environ["MLFLOW_TRACKING_USERNAME"] = dagshub_token
+        os.environ["MLFLOW_TRACKING_PASSWORD"] = dagshub_token
+
+    import mlflow
+    mlflow.set_tracking_uri(tracking_uri)
+
+    # Below is the code for local use
+    # import dagshub
+    # dagshub.init(repo_owner=REPO_OWNER, repo_name=REPO_NAME, mlflow=True)
+
+    _configured = True
+    return tracking_uri
@@ -1,46 +1,186 @@
-import boto3
+import io
 import os
 import sys
 import pandas as pd
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from src.logger import logging
 from src.exception import MyException
-from io import StringIO
 
 logging.getLogger("boto3").setLevel(logging.ERROR)
 logging.getLogger("botocore").setLevel(logging.ERROR)
 logging.getLogger("urllib3").setLevel(logging.ERROR)
 
+# Objects larger than this are fetched as parallel ranged GETs of this size
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+def bounded_map(executor: ThreadPoolExecutor, func, items, window: int):
+    """
+    Like executor.map, but with at most `window` calls submitted ahead of the consumer,
+    so results that have not been consumed yet never pile up in memory.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+class RangedObjectReader(io.RawIOBase):
+    """
+    Read-only file object over an S3 object, fetched as ranged GETs of part_size bytes.
+
+    Up to max_workers parts are downloaded concurrently ahead of the reader and handed out
+    in order, so memory stays at about max_workers * part_size however large the object is.
+    """
+    def __init__(self, s3_client, bucket_name: str, file_key: str, size: int, part_size: int,
+                 executor: ThreadPoolExecutor, max_workers: int):
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.file_key = file_key
+        ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+        self._parts = bounded_map(executor, self._fetch, ranges, max_workers)
+        self._buffer = memoryview(b"")
+
+    def _fetch(self, byte_range: tuple) -> bytes:
+        start, end = byte_range
+        obj = self.s3_client.get_object(Bucket=self.bucket_name, Key=self.file_key, Range=f"bytes={start}-{end}")
+        return obj['Body'].read()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            part = next(self._parts, None)
+            if part is None:
+                return 0
+            self._buffer = memoryview(part)
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
 class s3_operations:
-    def __init__(self, bucket_name: str, aws_access_key_id: str, aws_secret_access_key: str, region_name: str="us-east-1"):
+    def __init__(self, bucket_name: str, aws_access_key_id: str, aws_secret_access_key: str, region_name: str="us-east-1",
+                 endpoint_url: str = None):
         """
         Initializes the s3_operation class with AWS credentials and s3 bucket details.
+
+        :param endpoint_url: Alternative S3 endpoint, e.g. a local S3-compatible server.
         """
+        import boto3
+
         self.bucket_name = bucket_name
         self.s3_client = boto3.client(
             's3',
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
-            region_name=region_name
+            region_name=region_name,
+            endpoint_url=endpoint_url
         )
         logging.info("Data Ingestion from S3 bucket initialized.")
-    
-    def fetch_file_from_s3(self, file_key: str) -> pd.DataFrame:
+
+    def iter_csv_chunks(self, file_key: str, chunk_size: int = 50000, part_size: int = DEFAULT_PART_SIZE,
+                        max_workers: int = 4, **read_csv_kwargs):
+        """
+        Parse a CSV object incrementally, yielding DataFrames of at most chunk_size rows.
+
+        The body is parsed as it streams in, so the file is never held in memory as a whole.
+        Objects larger than part_size are downloaded as max_workers concurrent ranged GETs.
+
+        :param file_key: S3 file path
+        :param chunk_size: Rows per yielded DataFrame
+        :param part_size: Bytes per ranged GET
+        :param max_workers: Ranged GETs in flight; 1 streams the object with a single GET
+        :param read_csv_kwargs: Passed to pd.read_csv, e.g. usecols
+        :return: Iterator of Pandas DataFrames
+        """
+        try:
+            size = self.s3_client.head_object(Bucket=self.bucket_name, Key=file_key)['ContentLength']
+            if max_workers > 1 and size > part_size:
+                logging.info(f"Fetching '{file_key}' ({size} bytes) as ranged GETs of {part_size} bytes...")
+                with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s3-range") as executor:
+                    body = io.BufferedReader(RangedObjectReader(self.s3_client, self.bucket_name, file_key, size,
+                                                                part_size, executor, max_workers))
+                    yield from pd.read_csv(body, chunksize=chunk_size, **read_csv_kwargs)
+            else:
+                body = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_key)['Body']
+                try:
+                    yield from pd.read_csv(body, chunksize=chunk_size, **read_csv_kwargs)
+                finally:
+                    body.close()
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def fetch_file_from_s3(self, file_key: str, **kwargs) -> pd.DataFrame:
         """
         Fetches a CSV file from the s3 bucket and returns it as Pandas Dataframe.
 
         :param file_key: S3 file path
+        :param kwargs: Passed to iter_csv_chunks
         :return: Pandas DataFrame
         """
         try:
             logging.info(f"Fetching file '{file_key}' from S3 bucket '{self.bucket_name}'...")
-            obj = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_key)
-            df = pd.read_csv(StringIO(obj['Body'].read().decode('utf-8')))
+            df = pd.concat(self.iter_csv_chunks(file_key, **kwargs), ignore_index=True)
             logging.info(f"Successfully fetched and loaded '{file_key}' from S3 that has {len(df)} records.")
             return df
         except Exception as e:
             raise MyException(e, sys) from e
 
+    def list_keys(self, prefix: str, suffix: str = ".csv") -> list:
+        """Return the sorted keys under prefix that end with suffix."""
+        try:
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            keys = [obj['Key'] for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
+                    for obj in page.get('Contents', []) if obj['Key'].endswith(suffix)]
+            return sorted(keys)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def iter_prefix_chunks(self, prefix: str, suffix: str = ".csv", chunk_size: int = 50000, max_workers: int = 8,
+                           **read_csv_kwargs):
+        """
+        Fetch every CSV shard under prefix, max_workers shards at a time, yielding their
+        DataFrame chunks shard by shard in key order.
+
+        :param prefix: S3 key prefix of the shards
+        :param suffix: Only keys ending with this are fetched
+        :param chunk_size: Rows per yielded DataFrame
+        :param max_workers: Shards downloaded and parsed concurrently
+        :return: Iterator of Pandas DataFrames
+        """
+        try:
+            keys = self.list_keys(prefix, suffix)
+            logging.info(f"Fetching {len(keys)} shards under '{prefix}' from S3 bucket '{self.bucket_name}'...")
+
+            def fetch_shard(file_key):
+                return list(self.iter_csv_chunks(file_key, chunk_size, max_workers=1, **read_csv_kwargs))
+
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s3-shard") as executor:
+                for chunks in bounded_map(executor, fetch_shard, keys, max_workers):
+                    yield from chunks
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def fetch_prefix_from_s3(self, prefix: str, **kwargs) -> pd.DataFrame:
+        """
+        Fetches every CSV shard under prefix and returns them as one Pandas Dataframe.
+
+        :param prefix: S3 key prefix of the shards
+        :param kwargs: Passed to iter_prefix_chunks
+        :return: Pandas DataFrame
+        """
+        try:
+            df = pd.concat(self.iter_prefix_chunks(prefix, **kwargs), ignore_index=True)
+            logging.info(f"Successfully fetched and loaded '{prefix}' from S3 that has {len(df)} records.")
+            return df
+        except Exception as e:
+            raise MyException(e, sys) from e
+
 # Example usage
 if __name__ == "__main__":
     BUCKET_NAME = "review-analysis-project"
@@ -52,4 +192,4 @@ if __name__ == "__main__":
     df = data_ingestion.fetch_file_from_s3(FILE_KEY)
 
     if df is not None:
-        print(f"Data fetched with {len(df)} records...")
\ No newline at end of file
+        print(f"Data fetched with {len(df)} records...")
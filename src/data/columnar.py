@@ -0,0 +1,57 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Columns of the raw and interim datasets. sentiment is already 0/1 after ingestion;
+# Parquet dictionary-encodes it, so the label column takes almost no space on disk
+REVIEW_SCHEMA = pa.schema([('review', pa.string()), ('sentiment', pa.int8())])
+
+# review text dominates the files and compresses well with zstd
+PARQUET_OPTIONS = {'compression': 'zstd', 'use_dictionary': ['sentiment']}
+
+def to_table(df: pd.DataFrame) -> pa.Table:
+    """Convert a review DataFrame to an Arrow table with the dataset schema."""
+    return pa.Table.from_pandas(df[REVIEW_SCHEMA.names], schema=REVIEW_SCHEMA, preserve_index=False)
+
+def write_parquet(df: pd.DataFrame, path: str) -> None:
+    """Write a review DataFrame to a Parquet file, creating its directory."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    pq.write_table(to_table(df), path, **PARQUET_OPTIONS)
+
+def read_parquet(path: str, columns: list = None) -> pd.DataFrame:
+    """Read a Parquet file, decoding only the given columns."""
+    return pq.read_table(path, columns=columns).to_pandas()
+
+def iter_parquet(path: str, columns: list = None, chunk_size: int = 50000):
+    """Yield a Parquet file as DataFrames of at most chunk_size rows, decoding only the given columns."""
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+        yield batch.to_pandas()
+
+class ParquetChunkWriter:
+    """
+    Append DataFrame chunks to one Parquet file, one row group per chunk.
+
+    The file always exists after the writer is closed, so an input with no rows still
+    produces a readable, empty dataset.
+    """
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.rows_written = 0
+        self._writer = pq.ParquetWriter(path, REVIEW_SCHEMA, **PARQUET_OPTIONS)
+
+    def write(self, df: pd.DataFrame) -> None:
+        if len(df):
+            self._writer.write_table(to_table(df))
+            self.rows_written += len(df)
+
+    def close(self) -> None:
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
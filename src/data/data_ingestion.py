@@ -8,7 +8,9 @@ import yaml
 import logging
 from src.logger import logging
 from src.exception import MyException
+from src.perf import profile_stage, record_rows
 from src.connections.s3_connection import s3_operations
+from src.data.columnar import REVIEW_SCHEMA, ParquetChunkWriter, write_parquet
 
 def load_params(params_path: str) -> dict:
     """Load parameters from a yaml file."""
@@ -21,9 +23,9 @@ def load_params(params_path: str) -> dict:
         raise MyException(e, sys) from e
 
 def load_data(data_url: str) -> pd.DataFrame:
-    """Load data from a CSV file."""
+    """Load the review and sentiment columns of a CSV file."""
     try:
-        df = pd.read_csv(data_url)
+        df = pd.read_csv(data_url, usecols=REVIEW_SCHEMA.names)
         logging.info(f"Data loaded from {data_url}")
         return df
     except Exception as e:
@@ -41,23 +43,56 @@ def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
         raise MyException(e, sys) from e
 
 def save_data(train_data: pd.DataFrame, test_data: pd.DataFrame, data_path: str) -> None:
-    """Save the train and test data."""
+    """Save the train and test data as Parquet."""
     try:
         raw_data_path = os.path.join(data_path, 'raw')
-        os.makedirs(raw_data_path, exist_ok=True)
-        train_data.to_csv(os.path.join(raw_data_path, 'train.csv'), index=False)
-        test_data.to_csv(os.path.join(raw_data_path, 'test.csv'), index=False)
+        write_parquet(train_data, os.path.join(raw_data_path, 'train.parquet'))
+        write_parquet(test_data, os.path.join(raw_data_path, 'test.parquet'))
         logging.info(f"Train and test data saved to {raw_data_path}.")
     except Exception as e:
         raise MyException(e, sys) from e
 
+def ingest_data_streaming(data_url: str, data_path: str, test_size: float, chunk_size: int, random_state: int = 42) -> dict:
+    """
+    Stream the source CSV in chunks into the raw train and test Parquet files.
+
+    Each row is assigned to the test split with probability test_size using a seeded
+    generator, so the split is reproducible and only chunk_size rows are in memory.
+    """
+    try:
+        raw_data_path = os.path.join(data_path, 'raw')
+        rng = np.random.default_rng(random_state)
+
+        with ParquetChunkWriter(os.path.join(raw_data_path, 'train.parquet')) as train_writer, \
+                ParquetChunkWriter(os.path.join(raw_data_path, 'test.parquet')) as test_writer:
+            for chunk in pd.read_csv(data_url, usecols=REVIEW_SCHEMA.names, chunksize=chunk_size):
+                chunk = preprocess_data(chunk)
+                is_test = rng.random(len(chunk)) < test_size
+                train_writer.write(chunk[~is_test])
+                test_writer.write(chunk[is_test])
+        row_counts = {'train': train_writer.rows_written, 'test': test_writer.rows_written}
+
+        logging.info(f"Streamed {row_counts['train']} train and {row_counts['test']} test rows to {raw_data_path}.")
+        return row_counts
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+@profile_stage('data_ingestion')
 def main():
     try:
         params = load_params('params.yaml')
         test_size = params['data_ingestion']['test_size']
+        read_chunk_size = params['data_ingestion']['read_chunk_size']
         # test_size = 0.2
 
-        df = load_data(data_url="https://raw.githubusercontent.com/vikashishere/Datasets/refs/heads/main/data.csv")
+        data_url = "https://raw.githubusercontent.com/vikashishere/Datasets/refs/heads/main/data.csv"
+        if read_chunk_size:
+            row_counts = ingest_data_streaming(data_url, './data', test_size, read_chunk_size)
+            record_rows('train', row_counts['train'])
+            record_rows('test', row_counts['test'])
+            return
+
+        df = load_data(data_url=data_url)
         # s3 = s3_operations(bucket_name="review-analysis-project",
         #                    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
         #                    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"))
@@ -66,6 +101,8 @@ def main():
         final_df = preprocess_data(df)
         train_data, test_data = train_test_split(final_df, test_size=test_size, random_state=42)
         save_data(train_data, test_data, data_path='./data')
+        record_rows('train', len(train_data))
+        record_rows('test', len(test_data))
     except Exception as e:
         raise MyException(e, sys) from e
     
@@ -2,17 +2,108 @@ import numpy as np
 import pandas as pd
 import os
 import sys
-import re
-import nltk
-import string
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+import yaml
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor
 from src.logger import logging
 from src.exception import MyException
-nltk.download('wordnet')
-nltk.download('stopwords')
+from src.perf import profile_stage, record_counter, record_rows
+from src.data.normalization_cache import NormalizationCache
+from src.data.columnar import REVIEW_SCHEMA, ParquetChunkWriter, iter_parquet, read_parquet, write_parquet
+from src.text import TextNormalizer, default_normalizer
 
-def preprocess_dataframe(df: pd.DataFrame, col: str = "text") -> pd.DataFrame:
+# Normalizer owned by a pool worker process, built once by _init_worker
+_worker_normalizer = None
+
+def ensure_nltk_data() -> None:
+    """Download the NLTK corpora used by the normalizer if they are not installed yet."""
+    import nltk
+    for resource, package in (('corpora/wordnet', 'wordnet'), ('corpora/stopwords', 'stopwords')):
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            nltk.download(package)
+
+def load_params(params_path: str) -> dict:
+    """Load parameters from a yaml file."""
+    try:
+        with open(params_path, 'r') as file:
+            params = yaml.safe_load(file)
+        logging.debug(f"Parameters retrieved from {params_path}")
+        return params
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+def _init_worker(normalizer: TextNormalizer) -> None:
+    """Install the worker's normalizer and load stop words and WordNet once up front."""
+    global _worker_normalizer
+    _worker_normalizer = normalizer
+    _worker_normalizer.tokens("warming up the lemmatizer")
+
+def _normalize_chunk(texts: list) -> list:
+    """Normalize one chunk of texts inside a pool worker."""
+    return [_worker_normalizer(text) for text in texts]
+
+def create_pool(normalizer: TextNormalizer, n_jobs: int) -> ProcessPoolExecutor:
+    """
+    Create the worker pool used for normalization.
+
+    Args
+    ----
+        normalizer (TextNormalizer): The normalizer copied into every worker.
+        n_jobs (int): Number of worker processes. 1 means no pool, -1 uses every CPU.
+    Returns
+    -------
+        ProcessPoolExecutor: The pool, or None when normalization should run in-process.
+    """
+    if n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs == 1:
+        return None
+    return ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(normalizer,))
+
+def normalize_texts(texts: pd.Series, normalizer: TextNormalizer, executor: ProcessPoolExecutor = None,
+                    chunk_size: int = 2000, cache: NormalizationCache = None) -> list:
+    """
+    Normalize a column of texts, optionally across a pool of worker processes.
+
+    Args
+    ----
+        texts (pd.Series): The texts to normalize.
+        normalizer (TextNormalizer): The normalizer applied in-process.
+        executor (ProcessPoolExecutor): Pool from create_pool; None runs in-process.
+        chunk_size (int): Number of texts sent to a worker per task.
+        cache (NormalizationCache): Persistent cache; only texts missing from it are normalized.
+    Returns
+    -------
+        list: The normalized texts, in the same order as the input.
+    """
+    if cache is not None:
+        return _normalize_cached(texts.tolist(), normalizer, executor, chunk_size, cache)
+    values = texts.tolist()
+    if executor is None or len(values) <= chunk_size:
+        return [normalizer(text) for text in values]
+
+    chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+    # map yields results in submission order, so the chunks reassemble in input order
+    return [text for chunk in executor.map(_normalize_chunk, chunks) for text in chunk]
+
+def _normalize_cached(values: list, normalizer: TextNormalizer, executor: ProcessPoolExecutor,
+                      chunk_size: int, cache: NormalizationCache) -> list:
+    keys = [cache.key(text) for text in values]
+    results = cache.get_many(keys)
+    # each distinct missing review is normalized once, however often it repeats
+    missing = {key: text for key, text, result in zip(keys, values, results) if result is None}
+    if missing:
+        normalized = normalize_texts(pd.Series(list(missing.values()), dtype=object), normalizer, executor, chunk_size)
+        computed = dict(zip(missing, normalized))
+        cache.set_many(computed.items())
+        results = [computed[key] if result is None else result for key, result in zip(keys, results)]
+    return results
+
+def preprocess_dataframe(df: pd.DataFrame, col: str = "text", normalizer: TextNormalizer = None,
+                         n_jobs: int = 1, chunk_size: int = 2000, executor: ProcessPoolExecutor = None,
+                         cache: NormalizationCache = None) -> pd.DataFrame:
     """
     Preprocess a DataFrame by applying test preprocessing to a specific column.
 
@@ -20,58 +111,127 @@ def preprocess_dataframe(df: pd.DataFrame, col: str = "text") -> pd.DataFrame:
     ----
         df (pd.DataFrame): The dataframe to preprocess.
         col (str): The name  of the column containing text.
+        normalizer (TextNormalizer): Normalizer to apply. Defaults to the shared one.
+        n_jobs (int): Number of worker processes used when no executor is given and the
+            DataFrame has more than chunk_size rows.
+        chunk_size (int): Number of texts per worker task.
+        executor (ProcessPoolExecutor): An existing pool to reuse across calls.
+        cache (NormalizationCache): Persistent cache of normalized reviews.
     Returns
     -------
         pd.DataFrame: The preprocessed DataFrame.
     """ 
-    # Initialize lemmatizer and stopwords
-    lemmatizer = WordNetLemmatizer()
-    stop_words = set(stopwords.words("english"))
-
-    def preprocess_text(text: str) -> str:
-        """Helper function to preprocess a single text string."""
-        # Remove URLs
-        text = re.sub(r'https?://\S+|www\.\S+', '', text)
-        # Remove numbers
-        text = ''.join([char for char in text if not char.isdigit()])
-        # Convert to lowercase
-        text = text.lower()
-        # Remove punctuations
-        text = re.sub('[%s]' % re.escape(string.punctuation), ' ', text)
-        text = text.replace('؛', "")
-        text = re.sub('\s+', ' ', text).strip()
-        # Remove stop words
-        text = " ".join([word for word in text.split() if word not in stop_words])
-        # Lemmatization
-        text = " ".join([lemmatizer.lemmatize(word) for word in text.split()])
-        return text
-
-    df[col] = df[col].apply(preprocess_text)
+    normalizer = normalizer or default_normalizer()
+    # starting workers costs more than normalizing a single chunk in-process
+    if executor is None and len(df) > chunk_size:
+        executor = create_pool(normalizer, n_jobs)
+        try:
+            df[col] = normalize_texts(df[col], normalizer, executor, chunk_size, cache)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    else:
+        df[col] = normalize_texts(df[col], normalizer, executor, chunk_size, cache)
 
     df = df.dropna(subset=[col])
     logging.info("Data pre-processing completed.")
     return df
 
-def main():
+def preprocess_parquet_streaming(input_path: str, output_path: str, col: str, normalizer: TextNormalizer,
+                                 n_jobs: int = 1, chunk_size: int = 2000, read_chunk_size: int = 50000,
+                                 cache: NormalizationCache = None) -> int:
+    """
+    Preprocess a Parquet file batch by batch, writing each processed batch as a row group
+    of the output file.
+
+    Only read_chunk_size rows are held in memory at a time, so peak memory does not
+    depend on the size of the input file.
+
+    Args
+    ----
+        input_path (str): Parquet file to read.
+        output_path (str): Parquet file to write; it is overwritten.
+        col (str): The name of the column containing text.
+        normalizer (TextNormalizer): Normalizer to apply.
+        n_jobs (int): Number of worker processes, shared by all chunks.
+        chunk_size (int): Number of texts per worker task.
+        read_chunk_size (int): Number of rows read from the input per chunk.
+        cache (NormalizationCache): Persistent cache of normalized reviews.
+    Returns
+    -------
+        int: Number of rows written.
+    """
     try:
-        # fetch the data
-        train_data = pd.read_csv('./data/raw/train.csv')
-        test_data = pd.read_csv('./data/raw/test.csv')
+        # a file that fits in one worker task is normalized in-process
+        executor = create_pool(normalizer, n_jobs) if pq.ParquetFile(input_path).metadata.num_rows > chunk_size else None
+        try:
+            with ParquetChunkWriter(output_path) as writer:
+                for chunk in iter_parquet(input_path, REVIEW_SCHEMA.names, read_chunk_size):
+                    writer.write(preprocess_dataframe(chunk, col, normalizer, chunk_size=chunk_size,
+                                                      executor=executor, cache=cache))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        logging.info(f"Streamed {writer.rows_written} rows from {input_path} to {output_path}")
+        return writer.rows_written
+    except Exception as e:
+        raise MyException(e, sys) from e
 
-        # Transform the data
-        train_processed_data = preprocess_dataframe(train_data, 'review')
-        test_processed_data = preprocess_dataframe(test_data, 'review')
+@profile_stage('data_preprocessing')
+def main():
+    try:
+        ensure_nltk_data()
+        params = load_params('params.yaml')
+        preprocessing_params = params['data_preprocessing']
+        normalizer = TextNormalizer(lemma_cache_size=preprocessing_params['lemma_cache_size'])
+        n_jobs = preprocessing_params['n_jobs']
+        chunk_size = preprocessing_params['chunk_size']
+        cache_path = preprocessing_params.get('cache_path')
+        cache = NormalizationCache(cache_path) if cache_path else None
 
-        # Store the data inside data/processed
+        # Store the data inside data/interim
         data_path = os.path.join("./data", "interim")
         os.makedirs(data_path, exist_ok=True)
 
-        train_processed_data.to_csv(os.path.join(data_path, "train_processed.csv"), index=False)
-        test_processed_data.to_csv(os.path.join(data_path, "test_processed.csv"), index=False)
+        try:
+            if preprocessing_params['streaming']:
+                read_chunk_size = preprocessing_params['read_chunk_size']
+                for split in ('train', 'test'):
+                    rows = preprocess_parquet_streaming(os.path.join('./data/raw', f'{split}.parquet'),
+                                                        os.path.join(data_path, f'{split}_processed.parquet'),
+                                                        'review', normalizer, n_jobs, chunk_size, read_chunk_size,
+                                                        cache)
+                    record_rows(split, rows)
+            else:
+                # fetch the data
+                train_data = read_parquet('./data/raw/train.parquet', REVIEW_SCHEMA.names)
+                test_data = read_parquet('./data/raw/test.parquet', REVIEW_SCHEMA.names)
+
+                # Transform the data
+                train_processed_data = preprocess_dataframe(train_data, 'review', normalizer, n_jobs, chunk_size,
+                                                            cache=cache)
+                test_processed_data = preprocess_dataframe(test_data, 'review', normalizer, n_jobs, chunk_size,
+                                                           cache=cache)
+
+                write_parquet(train_processed_data, os.path.join(data_path, "train_processed.parquet"))
+                write_parquet(test_processed_data, os.path.join(data_path, "test_processed.parquet"))
+                record_rows('train', len(train_processed_data))
+                record_rows('test', len(test_processed_data))
+        finally:
+            if cache is not None:
+                cache.close()
+
+        if cache is not None:
+            record_counter('normalization_cache_hits', cache.hits)
+            record_counter('normalization_cache_misses', cache.misses)
+            logging.info(f"Normalization cache: {cache.hits} hits, {cache.misses} misses.")
+        if n_jobs == 1:
+            cache_info = normalizer.lemma_cache_info()
+            logging.info(f"Lemma cache: {cache_info.hits} hits, {cache_info.misses} misses, {cache_info.currsize} entries.")
 
         logging.info(f"Processed data saved to {data_path}")
     except Exception as e:
         raise MyException(e, sys) from e
     
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
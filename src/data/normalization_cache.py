@@ -0,0 +1,65 @@
+import os
+import sqlite3
+import hashlib
+from src.text import NORMALIZER_VERSION
+
+class NormalizationCache:
+    """
+    Persistent per-review cache of normalized text, stored in a local SQLite file.
+
+    Entries are keyed by a hash of the normalizer version and the raw review, so a re-run
+    after appending reviews or changing a downstream stage only normalizes reviews it has
+    not seen, and bumping NORMALIZER_VERSION invalidates every entry at once. Entries of
+    old versions are never read again; delete the file to reclaim their space.
+    """
+    # stays below SQLite's default limit on bound parameters per statement
+    BATCH_SIZE = 900
+
+    def __init__(self, path: str, version: str = NORMALIZER_VERSION):
+        """
+        :param path: SQLite file, created on first use.
+        :param version: Identifies the normalizer output; normalizers whose output differs
+            must not share a version within one file.
+        """
+        self.path = path
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS normalized (key BLOB PRIMARY KEY, value TEXT NOT NULL)")
+
+    def key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.version}\x00{text}".encode("utf-8")).digest()
+
+    def get_many(self, keys: list) -> list:
+        """Return the cached value for each key, or None where it is missing."""
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for i in range(0, len(unique_keys), self.BATCH_SIZE):
+            batch = unique_keys[i:i + self.BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            found.update(self._conn.execute(
+                f"SELECT key, value FROM normalized WHERE key IN ({placeholders})", batch))
+        values = [found.get(key) for key in keys]
+        hits = sum(value is not None for value in values)
+        self.hits += hits
+        self.misses += len(values) - hits
+        return values
+
+    def set_many(self, items) -> None:
+        """Store (key, value) pairs."""
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO normalized (key, value) VALUES (?, ?)", items)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,4 @@
+from src.experiments.runner import (
+    FeatureSet, ResourceLimits, build_feature_sets, default_algorithms, default_vectorizers, log_results, run_grid
+)
+from src.experiments.tuning import TuningResult, ValidationAndHoldoutScorer, build_pipeline, log_tuning_results, tune
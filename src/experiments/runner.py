@@ -0,0 +1,248 @@
+import os
+import sys
+import math
+import time
+import signal
+import hashlib
+import resource
+import argparse
+import pandas as pd
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+from src.logger import logging
+from src.exception import MyException
+from src.features.feature_store import load_features, save_features
+
+# Hyperparameters logged per algorithm, as in notebooks/exp2_bow_vs_tfidf.py
+LOGGED_PARAMS = {
+    'LogisticRegression': ['C'],
+    'MultinomialNB': ['alpha'],
+    'XGBoost': ['n_estimators', 'learning_rate'],
+    'RandomForest': ['n_estimators', 'max_depth'],
+    'GradientBoosting': ['n_estimators', 'learning_rate', 'max_depth'],
+}
+
+@dataclass(frozen=True)
+class FeatureSet:
+    """Train/test matrices of one vectorizer, cached as .npz files so jobs load them from disk."""
+    name: str
+    train_path: str
+    test_path: str
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """Per-job limits: CPU seconds and address space in MiB; None leaves a limit unset."""
+    cpu_seconds: int = None
+    memory_mb: int = None
+
+class CPULimitExceeded(Exception):
+    pass
+
+def default_algorithms() -> dict:
+    """The exp2 algorithms; XGBoost is included only when it is installed."""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+    algorithms = {
+        'LogisticRegression': LogisticRegression(),
+        'MultinomialNB': MultinomialNB(),
+        'RandomForest': RandomForestClassifier(),
+        'GradientBoosting': GradientBoostingClassifier(),
+    }
+    try:
+        from xgboost import XGBClassifier
+        algorithms['XGBoost'] = XGBClassifier()
+    except ImportError:
+        logging.info("xgboost is not installed, skipping XGBoost.")
+    return algorithms
+
+def default_vectorizers() -> dict:
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+    return {'BoW': CountVectorizer(), 'TF-IDF': TfidfVectorizer()}
+
+def build_feature_sets(texts: pd.Series, labels: pd.Series, vectorizers: dict, cache_dir: str,
+                       test_size: float = 0.2, random_state: int = 42) -> list:
+    """
+    Split once and fit each vectorizer once, caching the matrices under cache_dir.
+
+    Vectorizers are fitted on the training split only. The cache key covers the data,
+    the split and the vectorizer parameters, so unchanged feature sets are reused
+    across sweeps.
+
+    Args
+    ----
+        texts (pd.Series): Normalized reviews.
+        labels (pd.Series): Binary labels aligned with texts.
+        vectorizers (dict): Name -> unfitted vectorizer.
+        cache_dir (str): Directory holding the cached matrices.
+    Returns
+    -------
+        list: One FeatureSet per vectorizer.
+    """
+    try:
+        train_texts, test_texts, y_train, y_test = train_test_split(
+            texts, labels, test_size=test_size, random_state=random_state)
+        data_digest = hashlib.sha256(pd.util.hash_pandas_object(pd.DataFrame({'t': texts, 'y': labels}),
+                                                               index=False).values.tobytes()).hexdigest()
+        feature_sets = []
+        for name, vectorizer in vectorizers.items():
+            key = hashlib.sha256(f"{data_digest}|{test_size}|{random_state}|{type(vectorizer).__name__}|"
+                                 f"{sorted(vectorizer.get_params().items())}".encode('utf-8')).hexdigest()[:16]
+            feature_set = FeatureSet(name, os.path.join(cache_dir, f"{key}_train.npz"),
+                                     os.path.join(cache_dir, f"{key}_test.npz"))
+            if os.path.exists(feature_set.train_path) and os.path.exists(feature_set.test_path):
+                logging.info(f"Reusing cached {name} features from {cache_dir}")
+            else:
+                os.makedirs(cache_dir, exist_ok=True)
+                vectorizer = clone(vectorizer)
+                save_features(vectorizer.fit_transform(train_texts), y_train.values, feature_set.train_path)
+                save_features(vectorizer.transform(test_texts), y_test.values, feature_set.test_path)
+                logging.info(f"Fitted {name} once and cached its features in {cache_dir}")
+            feature_sets.append(feature_set)
+        return feature_sets
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+# True while a job with a CPU limit is running in this worker
+_cpu_limited = False
+
+def _raise_cpu_limit(signum, frame):
+    # SIGXCPU repeats every second over the soft limit; late ones must not hit the next job
+    if _cpu_limited:
+        raise CPULimitExceeded("CPU time limit exceeded")
+
+def _apply_limits(limits: ResourceLimits) -> dict:
+    """
+    Lower the soft limits of this worker for one job and return the previous ones. Hard
+    limits are left alone so they can be restored for the next job in the same worker.
+    """
+    global _cpu_limited
+    previous = {}
+    if limits.cpu_seconds is not None:
+        # RLIMIT_CPU counts the whole life of the worker, so extend from what it used already
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = math.ceil(usage.ru_utime + usage.ru_stime)
+        signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+        _cpu_limited = True
+        previous[resource.RLIMIT_CPU] = resource.getrlimit(resource.RLIMIT_CPU)
+        resource.setrlimit(resource.RLIMIT_CPU, (used + limits.cpu_seconds, previous[resource.RLIMIT_CPU][1]))
+    if limits.memory_mb is not None:
+        previous[resource.RLIMIT_AS] = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (limits.memory_mb * 1024 * 1024, previous[resource.RLIMIT_AS][1]))
+    return previous
+
+def _restore_limits(previous: dict) -> None:
+    global _cpu_limited
+    _cpu_limited = False
+    for limit, values in previous.items():
+        resource.setrlimit(limit, values)
+
+def run_job(algo_name: str, estimator, feature_set: FeatureSet, limits: ResourceLimits) -> dict:
+    """Fit and evaluate one algorithm on one feature set inside a pool worker."""
+    result = {'algorithm': algo_name, 'vectorizer': feature_set.name, 'params': {}, 'metrics': {}, 'error': None}
+    try:
+        X_train, y_train = load_features(feature_set.train_path)
+        X_test, y_test = load_features(feature_set.test_path)
+        previous_limits = _apply_limits(limits)
+        try:
+            start = time.perf_counter()
+            model = clone(estimator).fit(X_train, y_train)
+            fit_seconds = time.perf_counter() - start
+            y_pred = model.predict(X_test)
+        finally:
+            _restore_limits(previous_limits)
+        result['params'] = {name: getattr(model, name) for name in LOGGED_PARAMS.get(algo_name, [])}
+        result['metrics'] = {
+            "accuracy": accuracy_score(y_test, y_pred),
+            "precision": precision_score(y_test, y_pred),
+            "recall": recall_score(y_test, y_pred),
+            "f1_score": f1_score(y_test, y_pred),
+            "fit_seconds": fit_seconds,
+        }
+    except (CPULimitExceeded, MemoryError) as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+def run_grid(algorithms: dict, feature_sets: list, max_workers: int = None,
+             limits: ResourceLimits = ResourceLimits()) -> list:
+    """
+    Run every algorithm x feature set job across a process pool.
+
+    Failed jobs, including those stopped by a resource limit, come back with an 'error'
+    instead of aborting the sweep. Results are in grid order.
+    """
+    try:
+        jobs = [(algo_name, estimator, feature_set)
+                for algo_name, estimator in algorithms.items() for feature_set in feature_sets]
+        results = [None] * len(jobs)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(run_job, algo_name, estimator, feature_set, limits): i
+                       for i, (algo_name, estimator, feature_set) in enumerate(jobs)}
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if result['error']:
+                    logging.warning(f"{result['algorithm']} with {result['vectorizer']} failed: {result['error']}")
+                else:
+                    logging.info(f"{result['algorithm']} with {result['vectorizer']}: {result['metrics']}")
+        return results
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+def log_results(results: list, experiment_name: str, test_size: float, parent_run_name: str = "All Experiments") -> None:
+    """Log one nested MLflow run per job from the parent process; tracking must already be configured."""
+    try:
+        import mlflow
+        mlflow.set_experiment(experiment_name)
+        with mlflow.start_run(run_name=parent_run_name):
+            for result in results:
+                with mlflow.start_run(run_name=f"{result['algorithm']} with {result['vectorizer']}", nested=True):
+                    mlflow.log_params({"vectorizer": result['vectorizer'], "algorithm": result['algorithm'],
+                                       "test_size": test_size})
+                    if result['error']:
+                        mlflow.log_param("error", result['error'])
+                        continue
+                    mlflow.log_params(result['params'])
+                    mlflow.log_metrics(result['metrics'])
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare algorithms across vectorizers in parallel.")
+    parser.add_argument("--data", default="notebooks/data.csv")
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--cache-dir", default=".cache/experiments")
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--cpu-seconds", type=int, default=None, help="CPU time limit per job")
+    parser.add_argument("--memory-mb", type=int, default=None, help="Address space limit per job")
+    parser.add_argument("--experiment-name", default="Bow vs TfIdf")
+    parser.add_argument("--tracking-uri", default=None,
+                        help="MLflow tracking URI, e.g. sqlite:///mlflow.db; defaults to the DagsHub server")
+    args = parser.parse_args()
+
+    try:
+        from src.text import normalize_text
+        df = pd.read_csv(args.data)
+        df = df[df['sentiment'].isin(['positive', 'negative'])]
+        texts = df['review'].apply(normalize_text)
+        labels = (df['sentiment'] == 'positive').astype(int)
+
+        feature_sets = build_feature_sets(texts, labels, default_vectorizers(), args.cache_dir, args.test_size)
+        results = run_grid(default_algorithms(), feature_sets, args.max_workers,
+                           ResourceLimits(args.cpu_seconds, args.memory_mb))
+
+        if args.tracking_uri:
+            os.environ["MLFLOW_TRACKING_URI"] = args.tracking_uri
+        from src.connections.dagshub_connection import configure_mlflow_tracking
+        configure_mlflow_tracking()
+        log_results(results, args.experiment_name, args.test_size)
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+if __name__ == "__main__":
+    main()
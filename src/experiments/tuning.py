@@ -0,0 +1,155 @@
+import os
+import sys
+import argparse
+import pandas as pd
+from dataclasses import dataclass
+from joblib import Memory
+from sklearn.pipeline import Pipeline
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+from src.logger import logging
+from src.exception import MyException
+
+METRICS = {'accuracy': accuracy_score, 'precision': precision_score, 'recall': recall_score, 'f1_score': f1_score}
+
+class ValidationAndHoldoutScorer:
+    """
+    Multimetric scorer for the search: F1 on the CV validation fold, plus every metric of
+    the same fitted fold model on a fixed holdout set.
+
+    The holdout metrics end up in cv_results_ as mean_test_holdout_<metric>, so no
+    candidate has to be refitted afterwards just to evaluate it.
+    """
+    def __init__(self, X_holdout, y_holdout):
+        self.X_holdout = X_holdout
+        self.y_holdout = y_holdout
+
+    def __call__(self, estimator, X, y) -> dict:
+        scores = {'f1': f1_score(y, estimator.predict(X))}
+        y_pred = estimator.predict(self.X_holdout)
+        for name, metric in METRICS.items():
+            scores[f'holdout_{name}'] = metric(self.y_holdout, y_pred)
+        return scores
+
+@dataclass
+class TuningResult:
+    search: object
+    # one dict of params, CV scores and holdout metrics per candidate (grid search only)
+    candidates: list
+    # holdout metrics of the refitted best estimator
+    best_holdout: dict
+
+def build_pipeline(memory: Memory = None) -> Pipeline:
+    """TF-IDF + logistic regression; with `memory`, each fold's fitted TF-IDF is computed once."""
+    return Pipeline([('tfidf', TfidfVectorizer()), ('clf', LogisticRegression())], memory=memory)
+
+def tune(texts: pd.Series, labels: pd.Series, param_grid: dict, cache_dir: str = None, search: str = 'grid',
+         cv: int = 5, test_size: float = 0.2, n_jobs: int = -1, random_state: int = 42) -> TuningResult:
+    """
+    Tune the classifier of the TF-IDF pipeline on raw texts.
+
+    Args
+    ----
+        texts (pd.Series): Normalized reviews.
+        labels (pd.Series): Binary labels.
+        param_grid (dict): Grid over the classifier's parameters, e.g. {"C": [0.1, 1]}.
+        cache_dir (str): joblib cache for the per-fold TF-IDF matrices. All candidates of
+            a fold share one fit, and the cache also carries over to later runs.
+        search (str): 'grid' scores every candidate on all folds. 'halving' runs
+            successive halving (HalvingGridSearchCV), which gives the full sample only to
+            the best candidates; holdout metrics are then computed for the winner only.
+        cv (int): Number of stratified folds, shared by every candidate.
+    Returns
+    -------
+        TuningResult: The fitted search, per-candidate metrics and the best model's holdout metrics.
+    """
+    try:
+        X_train, X_holdout, y_train, y_holdout = train_test_split(
+            texts, labels, test_size=test_size, random_state=random_state)
+        pipeline = build_pipeline(Memory(cache_dir, verbose=0) if cache_dir else None)
+        grid = {f'clf__{name}': values for name, values in param_grid.items()}
+        folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+
+        if search == 'halving':
+            from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+            from sklearn.model_selection import HalvingGridSearchCV
+            searcher = HalvingGridSearchCV(pipeline, grid, cv=folds, scoring='f1', n_jobs=n_jobs,
+                                           random_state=random_state)
+        else:
+            searcher = GridSearchCV(pipeline, grid, cv=folds, n_jobs=n_jobs, refit='f1',
+                                    scoring=ValidationAndHoldoutScorer(X_holdout, y_holdout))
+        searcher.fit(X_train, y_train)
+
+        results = searcher.cv_results_
+        candidates = []
+        for i, params in enumerate(results['params']):
+            candidate = {'params': {name.split('__', 1)[1]: value for name, value in params.items()},
+                         'mean_cv_score': results['mean_test_f1' if search != 'halving' else 'mean_test_score'][i],
+                         'std_cv_score': results['std_test_f1' if search != 'halving' else 'std_test_score'][i]}
+            if search != 'halving':
+                candidate['holdout'] = {name: results[f'mean_test_holdout_{name}'][i] for name in METRICS}
+            candidates.append(candidate)
+
+        y_pred = searcher.best_estimator_.predict(X_holdout)
+        best_holdout = {name: metric(y_holdout, y_pred) for name, metric in METRICS.items()}
+        logging.info(f"Best params {searcher.best_params_}: CV F1 {searcher.best_score_:.4f}, holdout {best_holdout}")
+        return TuningResult(searcher, candidates, best_holdout)
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+def log_tuning_results(result: TuningResult, experiment_name: str) -> None:
+    """Log the candidates as nested runs and the best model in the parent run; nothing is refitted."""
+    try:
+        import mlflow
+        import mlflow.sklearn
+        mlflow.set_experiment(experiment_name)
+        with mlflow.start_run():
+            for candidate in result.candidates:
+                with mlflow.start_run(run_name=f"LR with params: {candidate['params']}", nested=True):
+                    mlflow.log_params(candidate['params'])
+                    metrics = {'mean_cv_score': candidate['mean_cv_score'], 'std_cv_score': candidate['std_cv_score']}
+                    metrics.update(candidate.get('holdout', {}))
+                    mlflow.log_metrics(metrics)
+
+            best_params = {name.split('__', 1)[1]: value for name, value in result.search.best_params_.items()}
+            mlflow.log_params(best_params)
+            mlflow.log_metric("best_f1_score", result.search.best_score_)
+            mlflow.log_metrics({f"holdout_{name}": value for name, value in result.best_holdout.items()})
+            mlflow.sklearn.log_model(result.search.best_estimator_, "model")
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the TF-IDF + logistic regression pipeline.")
+    parser.add_argument("--data", default="notebooks/data.csv")
+    parser.add_argument("--search", choices=["grid", "halving"], default="grid")
+    parser.add_argument("--cache-dir", default=".cache/tuning")
+    parser.add_argument("--cv", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--experiment-name", default="LoR Hyperparameter Tuning")
+    parser.add_argument("--tracking-uri", default=None,
+                        help="MLflow tracking URI, e.g. sqlite:///mlflow.db; defaults to the DagsHub server")
+    args = parser.parse_args()
+
+    try:
+        from src.text import normalize_text
+        df = pd.read_csv(args.data)
+        df = df[df['sentiment'].isin(['positive', 'negative'])]
+        texts = df['review'].astype(str).apply(normalize_text)
+        labels = (df['sentiment'] == 'positive').astype(int)
+
+        param_grid = {"C": [0.1, 1, 10], "penalty": ["l1", "l2"], "solver": ["liblinear"]}
+        result = tune(texts, labels, param_grid, args.cache_dir, args.search, args.cv, n_jobs=args.n_jobs)
+
+        if args.tracking_uri:
+            os.environ["MLFLOW_TRACKING_URI"] = args.tracking_uri
+        from src.connections.dagshub_connection import configure_mlflow_tracking
+        configure_mlflow_tracking()
+        log_tuning_results(result, args.experiment_name)
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,11 @@ from sklearn.feature_extraction.text import CountVectorizer
 import yaml
 from src.logger import logging
 from src.exception import MyException
+from src.perf import profile_stage, record_rows
+from src.features.feature_store import save_features
+from src.text import make_hashing_vectorizer
+from src.data.columnar import REVIEW_SCHEMA, iter_parquet, read_parquet
+import scipy.sparse
 import pickle
 
 def load_params(params_path: str) -> dict:
@@ -19,9 +24,9 @@ def load_params(params_path: str) -> dict:
         raise MyException(e, sys) from e
 
 def load_data(data_url: str) -> pd.DataFrame:
-    """Load data from a CSV file."""
+    """Load the review and sentiment columns of a Parquet file."""
     try:
-        df = pd.read_csv(data_url)
+        df = read_parquet(data_url, REVIEW_SCHEMA.names)
         logging.info(f"Data loaded from {data_url}")
         return df
     except Exception as e:
@@ -38,44 +43,74 @@ def apply_bow(train_data: pd.DataFrame, test_data: pd.DataFrame, max_feature: in
         X_test = test_data['review'].values
         y_test = test_data['sentiment'].values
 
+        # the matrices stay sparse end to end; only non-zero counts are stored
         X_train_bow = vectorizer.fit_transform(X_train)
         X_test_bow = vectorizer.transform(X_test)
 
-        train_df = pd.DataFrame(X_train_bow.toarray())
-        train_df['label'] = y_train
-
-        test_df = pd.DataFrame(X_test_bow.toarray())
-        test_df['label'] = y_test
-
         pickle.dump(vectorizer, open('models/vectorizer.pkl', 'wb'))
         logging.info("Bag of words applied and data transformed.")
 
-        return train_df, test_df
+        return (X_train_bow, y_train), (X_test_bow, y_test)
     except Exception as e:
         raise MyException(e, sys) from e
     
-def save_data(df: pd.DataFrame, file_path: str) -> None:
-    """Save the dataframe to a CSV file."""
+def hash_reviews(file_path: str, n_features: int, chunk_size: int) -> tuple:
+    """Hash the reviews of a processed Parquet file into n_features buckets, one chunk at a time."""
     try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        df.to_csv(file_path, index=False)
-        logging.info(f"Data saved to {file_path}.")
+        vectorizer = make_hashing_vectorizer(n_features)
+        features, labels = [], []
+        for chunk in iter_parquet(file_path, REVIEW_SCHEMA.names, chunk_size):
+            features.append(vectorizer.transform(chunk['review'].values))
+            labels.append(chunk['sentiment'].values)
+        logging.info(f"Hashed reviews from {file_path} into {n_features} buckets.")
+        return scipy.sparse.vstack(features, format='csr'), np.concatenate(labels)
     except Exception as e:
         raise MyException(e, sys) from e
-    
+
+def apply_hashing(train_path: str, test_path: str, n_features: int, chunk_size: int) -> tuple:
+    """
+    Apply the hashing vectorizer to the train and test data.
+
+    There is no vocabulary to fit, so both files are streamed straight from disk. The
+    vectorizer is still pickled so models/vectorizer.pkl exists in either mode, but it
+    only holds its parameters.
+    """
+    try:
+        logging.info("Applying hashing vectorizer...")
+        train = hash_reviews(train_path, n_features, chunk_size)
+        test = hash_reviews(test_path, n_features, chunk_size)
+
+        pickle.dump(make_hashing_vectorizer(n_features), open('models/vectorizer.pkl', 'wb'))
+        logging.info("Hashing vectorizer applied and data transformed.")
+
+        return train, test
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+@profile_stage('feature_engineering')
 def main():
     try:
         params = load_params('params.yaml')
-        max_features = params['feature_engineering']['max_features']
+        feature_params = params['feature_engineering']
+        max_features = feature_params['max_features']
         # max_features = 20
 
-        train_data = load_data("./data/interim/train_processed.csv")
-        test_data = load_data("./data/interim/test_processed.csv")
+        train_path = "./data/interim/train_processed.parquet"
+        test_path = "./data/interim/test_processed.parquet"
 
-        train_df, test_df = apply_bow(train_data, test_data, max_features)
+        if feature_params['vectorizer'] == 'hashing':
+            (X_train, y_train), (X_test, y_test) = apply_hashing(
+                train_path, test_path, feature_params['hashing_n_features'], feature_params['read_chunk_size']
+            )
+        else:
+            train_data = load_data(train_path)
+            test_data = load_data(test_path)
+            (X_train, y_train), (X_test, y_test) = apply_bow(train_data, test_data, max_features)
 
-        save_data(train_df, os.path.join("./data", "processed", "train_bow.csv"))
-        save_data(test_df, os.path.join("./data", "processed", "test_bow.csv"))
+        save_features(X_train, y_train, os.path.join("./data", "processed", "train_bow.npz"))
+        save_features(X_test, y_test, os.path.join("./data", "processed", "test_bow.npz"))
+        record_rows('train', X_train.shape[0])
+        record_rows('test', X_test.shape[0])
 
         logging.info("Feature engineering done.")
     except Exception as e:
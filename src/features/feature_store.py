@@ -0,0 +1,92 @@
+import numpy as np
+import os
+import sys
+import zipfile
+import scipy.sparse
+from src.logger import logging
+from src.exception import MyException
+
+def labels_path(file_path: str) -> str:
+    """Return the path of the labels array stored next to a feature matrix."""
+    return os.path.splitext(file_path)[0] + '_labels.npy'
+
+def save_features(features: scipy.sparse.spmatrix, labels: np.ndarray, file_path: str) -> None:
+    """
+    Save a sparse feature matrix as .npz and its labels as a .npy array beside it.
+
+    :param features: Sparse matrix with one row per review.
+    :param labels: Array with one label per row of features.
+    :param file_path: Path of the .npz file to write.
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        scipy.sparse.save_npz(file_path, scipy.sparse.csr_matrix(features))
+        np.save(labels_path(file_path), np.asarray(labels))
+        logging.info(f"Features {features.shape} with {features.nnz} non-zeros saved to {file_path}.")
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+def load_features(file_path: str) -> tuple:
+    """
+    Load a feature matrix saved by save_features.
+
+    :param file_path: Path of the .npz file.
+    :returns: The CSR feature matrix and its labels array.
+    """
+    try:
+        features = scipy.sparse.load_npz(file_path).tocsr()
+        labels = np.load(labels_path(file_path))
+        logging.info(f"Features {features.shape} loaded from {file_path}")
+        return features, labels
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+def _open_array(archive: zipfile.ZipFile, name: str) -> tuple:
+    """Open one array of an .npz archive as a stream positioned after its header."""
+    stream = archive.open(f'{name}.npy')
+    version = np.lib.format.read_magic(stream)
+    read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+    shape, _, dtype = read_header(stream)
+    return stream, dtype
+
+def _read_values(stream, dtype: np.dtype, count: int) -> np.ndarray:
+    return np.frombuffer(stream.read(int(count) * dtype.itemsize), dtype=dtype)
+
+def feature_shape(file_path: str) -> tuple:
+    """Return the (rows, columns) of a feature matrix saved by save_features without loading it."""
+    try:
+        with zipfile.ZipFile(file_path) as archive, archive.open('shape.npy') as stream:
+            return tuple(int(n) for n in np.lib.format.read_array(stream))
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+def iter_features(file_path: str, chunk_size: int):
+    """
+    Yield a feature matrix saved by save_features as (features, labels) chunks of at most
+    chunk_size rows.
+
+    The CSR arrays are decompressed and read sequentially, and the labels are memory
+    mapped, so memory holds one chunk at a time whatever the size of the matrix.
+
+    :param file_path: Path of the .npz file.
+    :param chunk_size: Rows per chunk.
+    """
+    try:
+        n_rows, n_columns = feature_shape(file_path)
+        labels = np.load(labels_path(file_path), mmap_mode='r')
+        with zipfile.ZipFile(file_path) as archive:
+            indptr_stream, indptr_dtype = _open_array(archive, 'indptr')
+            indices_stream, indices_dtype = _open_array(archive, 'indices')
+            data_stream, data_dtype = _open_array(archive, 'data')
+            start = _read_values(indptr_stream, indptr_dtype, 1)[0]
+            for first_row in range(0, n_rows, chunk_size):
+                ends = _read_values(indptr_stream, indptr_dtype, min(chunk_size, n_rows - first_row))
+                nnz = ends[-1] - start
+                indptr = np.concatenate(([0], ends - start))
+                features = scipy.sparse.csr_matrix((_read_values(data_stream, data_dtype, nnz),
+                                                    _read_values(indices_stream, indices_dtype, nnz), indptr),
+                                                   shape=(len(ends), n_columns))
+                yield features, np.asarray(labels[first_row:first_row + len(ends)])
+                start = ends[-1]
+    except Exception as e:
+        raise MyException(e, sys) from e
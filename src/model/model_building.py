@@ -1,21 +1,28 @@
 import numpy as np
-import pandas as pd
+import os
+import json
+import yaml
+import hashlib
 import pickle
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from src.logger import logging
 from src.exception import MyException
+from src.perf import profile_stage, record_rows
+from src.features.feature_store import feature_shape, iter_features, load_features
+import scipy.sparse
 import sys
 
-def load_data(file_path: str) -> pd.DataFrame:
-    """Load data from a CSV file."""
+def load_params(params_path: str) -> dict:
+    """Load parameters from a yaml file."""
     try:
-        df = pd.read_csv(file_path)
-        logging.info(f"Data loaded from {file_path}")
-        return df
+        with open(params_path, 'r') as file:
+            params = yaml.safe_load(file)
+        logging.debug(f"Parameters retrieved from {params_path}")
+        return params
     except Exception as e:
         raise MyException(e, sys) from e
 
-def train_model(X_train: np.ndarray, y_train: np.ndarray) -> LogisticRegression:
+def train_model(X_train: scipy.sparse.csr_matrix, y_train: np.ndarray) -> LogisticRegression:
     try:
         clf = LogisticRegression(C=1, solver='liblinear', penalty='l2')
         clf.fit(X_train, y_train)
@@ -23,7 +30,128 @@ def train_model(X_train: np.ndarray, y_train: np.ndarray) -> LogisticRegression:
         return clf
     except Exception as e:
         raise MyException(e, sys) from e
-    
+
+def load_training_state(file_path: str) -> dict:
+    """Load the online training state, or a fresh state if none was saved yet."""
+    try:
+        if not os.path.exists(file_path):
+            return {'rows_seen': 0}
+        with open(file_path, 'r') as file:
+            state = json.load(file)
+        logging.info(f"Training state loaded from {file_path}: {state}")
+        return state
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+def feature_space_fingerprint(vectorizer_path: str) -> str:
+    """
+    Hash the vectorizer's class, parameters and fitted vocabulary (if any).
+
+    Two feature matrices with the same fingerprint put the same term in the same column;
+    a refitted BoW vocabulary changes it even when max_features keeps the shape.
+    """
+    try:
+        with open(vectorizer_path, 'rb') as file:
+            vectorizer = pickle.load(file)
+        description = {'class': type(vectorizer).__name__, 'params': vectorizer.get_params(),
+                       'vocabulary': sorted(getattr(vectorizer, 'vocabulary_', {}).items())}
+        return hashlib.sha256(json.dumps(description, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+class RowsFingerprint:
+    """
+    Incremental hash of training rows and their labels.
+
+    Each CSR array is hashed as one continuous stream, so the digest only depends on the
+    rows fed in, not on how they were split into chunks.
+    """
+    def __init__(self):
+        self._digests = [hashlib.sha256() for _ in range(4)]
+
+    def update(self, X: scipy.sparse.csr_matrix, y: np.ndarray) -> None:
+        X = scipy.sparse.csr_matrix(X)
+        for digest, array in zip(self._digests, (X.data, X.indices, np.diff(X.indptr), np.asarray(y))):
+            digest.update(np.ascontiguousarray(array).tobytes())
+
+    def hexdigest(self) -> str:
+        return hashlib.sha256("".join(digest.hexdigest() for digest in self._digests).encode('utf-8')).hexdigest()
+
+def load_resumable_model(model_path: str, state: dict, feature_space: str, shape: tuple) -> SGDClassifier:
+    """
+    Return the saved model if online training can continue from the checkpoint, else None.
+
+    The checkpoint must come from the same feature space and cover no more rows than the
+    training data has now; whether those rows are unchanged is checked while streaming.
+    """
+    try:
+        rows_seen = state.get('rows_seen', 0)
+        if not (os.path.exists(model_path) and 0 < rows_seen <= shape[0] and state.get('rows_fingerprint')
+                and state.get('feature_space') == feature_space):
+            return None
+        with open(model_path, 'rb') as file:
+            model = pickle.load(file)
+        if isinstance(model, SGDClassifier) and getattr(model, 'n_features_in_', None) == shape[1]:
+            return model
+        return None
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+def _fit_stream(clf: SGDClassifier, features_path: str, chunk_size: int, skip_rows: int = 0,
+                expected_fingerprint: str = None) -> tuple:
+    """
+    Stream the training data once: hash the first skip_rows rows, stop with None if they do
+    not match expected_fingerprint, and partial_fit every row after them.
+
+    :return: (model, fingerprint of all rows), or None when the seen rows changed.
+    """
+    classes = np.array([0, 1])
+    fingerprint = RowsFingerprint()
+    row = 0
+    for X, y in iter_features(features_path, chunk_size):
+        if row < skip_rows:
+            # the checkpoint may end inside this chunk if chunk_size changed since
+            seen = min(skip_rows - row, X.shape[0])
+            fingerprint.update(X[:seen], y[:seen])
+            row += seen
+            X, y = X[seen:], y[seen:]
+            if row == skip_rows and fingerprint.hexdigest() != expected_fingerprint:
+                return None
+        if X.shape[0]:
+            clf.partial_fit(X, y, classes=classes)
+            fingerprint.update(X, y)
+            row += X.shape[0]
+    return clf, fingerprint.hexdigest()
+
+def train_model_online(features_path: str, model_path: str, state: dict, feature_space: str,
+                       chunk_size: int) -> tuple:
+    """
+    Fold the training data into an SGDClassifier with partial_fit, one chunk at a time.
+
+    Training resumes from the checkpoint (model_path and state) when the feature space is
+    unchanged and the rows it consumed are still the first rows of the data, unchanged. In
+    practice that means the hashing vectorizer with streaming ingestion, which only appends
+    rows; anything else (a refitted BoW vocabulary, a reshuffled split) restarts from scratch.
+    The seen rows are verified in the same pass that trains on the new ones.
+
+    :return: (model, first row trained on in this run, fingerprint of all training rows)
+    """
+    try:
+        clf = load_resumable_model(model_path, state, feature_space, feature_shape(features_path))
+        if clf is not None:
+            rows_seen = state['rows_seen']
+            result = _fit_stream(clf, features_path, chunk_size, rows_seen, state['rows_fingerprint'])
+            if result is not None:
+                logging.info(f"Resumed online training from row {rows_seen}.")
+                return result[0], rows_seen, result[1]
+            logging.info("Rows seen by the checkpoint changed.")
+        logging.info("Starting online training from scratch.")
+        clf, fingerprint = _fit_stream(SGDClassifier(loss='log_loss', penalty='l2', random_state=42),
+                                       features_path, chunk_size)
+        return clf, 0, fingerprint
+    except Exception as e:
+        raise MyException(e, sys) from e
+
 def save_model(model: LogisticRegression, file_path: str) -> None:
     try:
         with open(file_path, 'wb') as file:
@@ -32,16 +160,41 @@ def save_model(model: LogisticRegression, file_path: str) -> None:
     except Exception as e:
         raise MyException(e, sys) from e
 
+def save_training_state(state: dict, file_path: str) -> None:
+    try:
+        with open(file_path, 'w') as file:
+            json.dump(state, file, indent=4)
+        logging.info(f"Training state saved to {file_path}")
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+@profile_stage('model_building')
 def main():
     try:
-        train_data = load_data('./data/processed/train_bow.csv')
-        X_train = train_data.iloc[:, :-1].values
-        y_train = train_data.iloc[:, -1].values
+        params = load_params('params.yaml')
+        building_params = params['model_building']
+        features_path = './data/processed/train_bow.npz'
+        feature_space = feature_space_fingerprint('models/vectorizer.pkl')
+        n_rows = feature_shape(features_path)[0]
+        record_rows('train', n_rows)
 
-        clf = train_model(X_train, y_train)
+        if building_params['mode'] == 'online':
+            state = load_training_state('models/training_state.json')
+            clf, start_row, fingerprint = train_model_online(features_path, 'models/model.pkl', state, feature_space,
+                                                             building_params['chunk_size'])
+            logging.info(f"Online training completed on {n_rows - start_row} new rows.")
+        else:
+            X_train, y_train = load_features(features_path)
+            clf = train_model(X_train, y_train)
+            rows = RowsFingerprint()
+            rows.update(X_train, y_train)
+            fingerprint = rows.hexdigest()
         save_model(clf, 'models/model.pkl')
+        save_training_state({'mode': building_params['mode'], 'rows_seen': n_rows,
+                             'feature_space': feature_space, 'rows_fingerprint': fingerprint},
+                            'models/training_state.json')
     except Exception as e:
         raise MyException(e, sys) from e
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,45 +1,23 @@
 import numpy as np
-import pandas as pd
 import pickle
 import json
 from sklearn.metrics import accuracy_score, precision_score, recall_score, roc_auc_score, f1_score
 from sklearn.linear_model import LogisticRegression
 import logging
-import mlflow
-import mlflow.sklearn
-import dagshub
-import os
 import sys
 from src.logger import logging
 from src.exception import MyException
+from src.connections.dagshub_connection import configure_mlflow_tracking
+from src.perf import profile_stage, record_rows
+from src.features.feature_store import load_features
+from src.serving.linear_scorer import LinearScorer
+import scipy.sparse
 import warnings
 
 warnings.simplefilter("ignore", UserWarning)
 warnings.filterwarnings("ignore")
 logging.getLogger("urllib3").setLevel(logging.ERROR)
 
-# Below is the code for production use
-# -------------------------------------------------------------------------------------
-# Set up DagsHub credentials for MLflow tracking
-dagshub_token = os.getenv("CAPSTONE_TEST")
-if not dagshub_token:
-    raise EnvironmentError("CAPSTONE_TEST environment variable is not set")
-
-os.environ["MLFLOW_TRACKING_USERNAME"] = dagshub_token
-os.environ["MLFLOW_TRACKING_PASSWORD"] = dagshub_token
-
-dagshub_url = "https://dagshub.com"
-repo_owner = "keshav1017"
-repo_name = "Capstone-Project"
-
-# Set up MLflow tracking URI
-mlflow.set_tracking_uri(f'{dagshub_url}/{repo_owner}/{repo_name}.mlflow')
-
-# Below is the code for local use
-
-# mlflow.set_tracking_uri('https://dagshub.com/keshav1017/Capstone-Project.mlflow')
-# dagshub.init(repo_owner='keshav1017', repo_name='Capstone-Project', mlflow=True)
-
 def load_model(file_path: str) -> LogisticRegression:
     try:
         with open(file_path, 'rb') as file:
@@ -49,16 +27,16 @@ def load_model(file_path: str) -> LogisticRegression:
     except Exception as e:
         raise MyException(e, sys) from e
     
-def load_data(file_path: str) -> pd.DataFrame:
-    """Load data from a CSV file."""
+def load_vectorizer(file_path: str):
     try:
-        df = pd.read_csv(file_path)
-        logging.info(f"Data loaded from {file_path}")
-        return df
+        with open(file_path, 'rb') as file:
+            vectorizer = pickle.load(file)
+        logging.info(f"Vectorizer loaded from {file_path}")
+        return vectorizer
     except Exception as e:
         raise MyException(e, sys) from e
 
-def evaluate_model(clf: LogisticRegression, X_test: np.ndarray, y_test: np.ndarray) -> dict:
+def evaluate_model(clf: LogisticRegression, X_test: scipy.sparse.csr_matrix, y_test: np.ndarray) -> dict:
     try:
         y_pred = clf.predict(X_test)
         y_pred_proba = clf.predict_proba(X_test)[:,-1]
@@ -99,15 +77,27 @@ def save_model_info(run_id: str, model_path: str, file_path: str) -> None:
     except Exception as e:
         raise MyException(e, sys) from e
 
+def export_scorer(clf, vectorizer, directory: str) -> None:
+    """Write the compact LinearScorer artifact used by the serving app's numpy backend."""
+    try:
+        LinearScorer.from_estimator(clf, vectorizer).save(directory)
+        logging.info(f"Linear scorer exported to {directory}")
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+@profile_stage('model_evaluation')
 def main():
+    # mlflow is heavy and needs the tracking credentials, so it is only set up when the stage runs
+    configure_mlflow_tracking()
+    import mlflow
+    import mlflow.sklearn
+
     mlflow.set_experiment("dvc-pipeline")
     with mlflow.start_run() as run:
         try:
             clf = load_model('./models/model.pkl')
-            test_data = load_data('./data/processed/test_bow.csv')
-
-            X_test = test_data.iloc[:, :-1].values
-            y_test = test_data.iloc[:, -1].values
+            X_test, y_test = load_features('./data/processed/test_bow.npz')
+            record_rows('test', X_test.shape[0])
 
             metrics = evaluate_model(clf, X_test, y_test)
 
@@ -131,6 +121,13 @@ def main():
 
             # log the metrics file to MLFlow
             mlflow.log_artifact('reports/metrics.json')
+
+            # log the vectorizer with the run so the serving app can fetch the matching pair
+            mlflow.log_artifact('models/vectorizer.pkl')
+
+            # export the weights (and BoW vocabulary) for the NumPy scorer used at serving time
+            export_scorer(clf, load_vectorizer('./models/vectorizer.pkl'), 'models/scorer')
+            mlflow.log_artifacts('models/scorer', artifact_path='scorer')
         except Exception as e:
             raise MyException(e, sys) from e
 
@@ -1,39 +1,16 @@
 import json
-import mlflow
 import logging
 from src.logger import logging
 from src.exception import MyException
+from src.connections.dagshub_connection import configure_mlflow_tracking
+from src.perf import profile_stage
 import sys
-import os
-import dagshub
 import warnings
 
 warnings.simplefilter("ignore", UserWarning)
 warnings.filterwarnings("ignore")
 logging.getLogger("urllib3").setLevel(logging.ERROR)
 
-# Below is the code for production use
-# -------------------------------------------------------------------------------------
-# Set up DagsHub credentials for MLflow tracking
-dagshub_token = os.getenv("CAPSTONE_TEST")
-if not dagshub_token:
-    raise EnvironmentError("CAPSTONE_TEST environment variable is not set")
-
-os.environ["MLFLOW_TRACKING_USERNAME"] = dagshub_token
-os.environ["MLFLOW_TRACKING_PASSWORD"] = dagshub_token
-
-dagshub_url = "https://dagshub.com"
-repo_owner = "keshav1017"
-repo_name = "Capstone-Project"
-
-# Set up MLflow tracking URI
-mlflow.set_tracking_uri(f'{dagshub_url}/{repo_owner}/{repo_name}.mlflow')
-
-# Below is the code for local use
-
-# mlflow.set_tracking_uri('https://dagshub.com/keshav1017/Capstone-Project.mlflow')
-# dagshub.init(repo_owner='keshav1017', repo_name='Capstone-Project', mlflow=True)
-
 def load_model_info(file_path: str) -> dict:
     """Load the model info from a JSON file."""
     try:
@@ -47,6 +24,9 @@ def load_model_info(file_path: str) -> dict:
 def register_model(model_name: str, model_info: dict) -> None:
     """Registers the model to the MLFlow Registry..."""
     try:
+        configure_mlflow_tracking()
+        import mlflow
+
         model_uri = f"runs:/{model_info['run_id']}/{model_info['model_path']}"
         
         # registers the model
@@ -63,6 +43,7 @@ def register_model(model_name: str, model_info: dict) -> None:
     except Exception as e:
         raise MyException(e, sys) from e
 
+@profile_stage('model_registration')
 def main():
     try:
         model_info_path = 'reports/experiment_info.json'
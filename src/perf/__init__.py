@@ -0,0 +1 @@
+from src.perf.stage_profiler import StageProfile, profile_stage, record_counter, record_rows
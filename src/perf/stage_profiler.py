@@ -0,0 +1,90 @@
+import os
+import sys
+import json
+import time
+import resource
+import functools
+from src.logger import logging
+
+# Profile of the stage currently running in this process, fed by record_rows and record_counter
+_active_profile = None
+
+def _peak_rss_mb(who: int) -> float:
+    """Peak resident set size in MiB; ru_maxrss is in KiB on Linux and bytes on macOS."""
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _cpu_seconds(who: int) -> float:
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+class StageProfile:
+    """Wall time, CPU time, peak RSS, row counts and other counters of one pipeline stage run."""
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.rows = {}
+        self.counters = {}
+
+    def __enter__(self) -> "StageProfile":
+        self._wall = time.perf_counter()
+        self._cpu_self = _cpu_seconds(resource.RUSAGE_SELF)
+        self._cpu_children = _cpu_seconds(resource.RUSAGE_CHILDREN)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.wall_seconds = time.perf_counter() - self._wall
+        self.cpu_seconds = _cpu_seconds(resource.RUSAGE_SELF) - self._cpu_self
+        # only children that have exited (and been waited for) are counted, e.g. a shut down pool
+        self.cpu_seconds_children = _cpu_seconds(resource.RUSAGE_CHILDREN) - self._cpu_children
+        self.peak_rss_mb = _peak_rss_mb(resource.RUSAGE_SELF)
+        self.peak_rss_children_mb = _peak_rss_mb(resource.RUSAGE_CHILDREN)
+
+    def to_dict(self) -> dict:
+        return {
+            'wall_seconds': round(self.wall_seconds, 3),
+            'cpu_seconds': round(self.cpu_seconds, 3),
+            'cpu_seconds_children': round(self.cpu_seconds_children, 3),
+            'peak_rss_mb': round(self.peak_rss_mb, 1),
+            'peak_rss_children_mb': round(self.peak_rss_children_mb, 1),
+            'rows': self.rows,
+            'counters': self.counters,
+        }
+
+def record_rows(name: str, count: int) -> None:
+    """Record a row count (e.g. 'train', 'test') for the stage being profiled, if any."""
+    if _active_profile is not None:
+        _active_profile.rows[name] = int(count)
+
+def record_counter(name: str, value: int) -> None:
+    """Record a counter that is not a row count (e.g. cache hits) for the stage being profiled, if any."""
+    if _active_profile is not None:
+        _active_profile.counters[name] = int(value)
+
+def profile_stage(stage: str, report_dir: str = 'reports/perf'):
+    """
+    Decorate a stage's main() to write its resource usage to <report_dir>/<stage>.json.
+
+    The report is only written when the stage succeeds, so a failed run never leaves
+    numbers behind for `dvc metrics diff` to compare against.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            global _active_profile
+            profile = StageProfile(stage)
+            _active_profile = profile
+            try:
+                with profile:
+                    result = func(*args, **kwargs)
+            finally:
+                _active_profile = None
+
+            os.makedirs(report_dir, exist_ok=True)
+            report_path = os.path.join(report_dir, f'{stage}.json')
+            with open(report_path, 'w') as file:
+                json.dump(profile.to_dict(), file, indent=4)
+            logging.info(f"Stage {stage}: {profile.wall_seconds:.2f}s wall, {profile.cpu_seconds:.2f}s CPU, "
+                         f"{profile.peak_rss_mb:.0f} MiB peak RSS; report saved to {report_path}")
+            return result
+        return wrapper
+    return decorator
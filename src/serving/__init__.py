@@ -0,0 +1,8 @@
+from src.serving.artifact_cache import ArtifactCache
+from src.serving.batcher import MicroBatcher
+from src.serving.linear_scorer import LinearScorer, VocabularyVectorizer
+from src.serving.model_store import (
+    LocalModelSource, ModelStore, RegistryModelSource, ServingBundle, build_vectorizer, load_scorer_bundle
+)
+from src.serving.prediction_cache import LRUCache, PredictionCache
+from src.serving.profiler import SamplingProfiler
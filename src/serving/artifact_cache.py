@@ -0,0 +1,94 @@
+import os
+import json
+import fcntl
+import shutil
+import hashlib
+import logging
+import tempfile
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+
+def file_digest(file_path: str) -> str:
+    """Return the sha256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ArtifactCache:
+    """
+    Host-local cache of model artifacts, one entry per (model name, version).
+
+    Entries live in a directory named after the hash of the key and carry a manifest of
+    sha256 digests for every file. Only one process per host downloads a missing entry:
+    the others block on a file lock and then read what it wrote. Entries are built in a
+    temporary directory and renamed into place, so readers never see a partial download.
+    The root directory is created on the first fetch.
+    """
+    def __init__(self, root: str):
+        self.root = root
+
+    def entry_dir(self, model_name: str, version: str, variant: str = "") -> str:
+        key = hashlib.sha256(f"{model_name}@{version}#{variant}".encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.root, key)
+
+    def is_valid(self, entry_dir: str) -> bool:
+        """Check that the entry exists and every file still matches its recorded digest."""
+        manifest_path = os.path.join(entry_dir, MANIFEST_FILE)
+        if not os.path.isfile(manifest_path):
+            return False
+        with open(manifest_path, 'r') as file:
+            manifest = json.load(file)
+        return all(
+            os.path.isfile(os.path.join(entry_dir, name)) and file_digest(os.path.join(entry_dir, name)) == digest
+            for name, digest in manifest['files'].items()
+        )
+
+    def fetch(self, model_name: str, version: str, download: Callable[[str], None], variant: str = "") -> str:
+        """
+        Return the local directory holding the artifacts of a model version.
+
+        :param model_name: Registered model name.
+        :param version: Model version.
+        :param download: Callable that writes the artifacts into the directory it is given;
+            only called when the entry is missing or corrupt.
+        :param variant: Distinguishes different artifact sets of the same version.
+        :returns: Path of the cache entry.
+        """
+        entry_dir = self.entry_dir(model_name, version, variant)
+        if self.is_valid(entry_dir):
+            logger.info(f"Loading {model_name} version {version} from cache {entry_dir}")
+            return entry_dir
+
+        os.makedirs(self.root, exist_ok=True)
+        with open(entry_dir + '.lock', 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # another process may have filled the entry while we waited for the lock
+                if self.is_valid(entry_dir):
+                    return entry_dir
+
+                staging_dir = tempfile.mkdtemp(prefix=os.path.basename(entry_dir) + '.', dir=self.root)
+                try:
+                    logger.info(f"Downloading {model_name} version {version} into the artifact cache")
+                    download(staging_dir)
+                    files = {}
+                    for dir_path, _, file_names in os.walk(staging_dir):
+                        for file_name in file_names:
+                            path = os.path.join(dir_path, file_name)
+                            files[os.path.relpath(path, staging_dir)] = file_digest(path)
+                    with open(os.path.join(staging_dir, MANIFEST_FILE), 'w') as file:
+                        json.dump({'model_name': model_name, 'version': str(version), 'variant': variant, 'files': files}, file, indent=4)
+
+                    if os.path.exists(entry_dir):
+                        shutil.rmtree(entry_dir)
+                    os.rename(staging_dir, entry_dir)
+                finally:
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return entry_dir
@@ -0,0 +1,89 @@
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-item requests into batched calls.
+
+    Items wait in a queue until either max_batch_size items are pending or the oldest has
+    waited max_wait seconds; then `process` runs once on the whole batch on a background
+    thread and every caller's future is resolved with its own result.
+    """
+    def __init__(self, process: Callable[[list], list], max_batch_size: int = 64, max_wait: float = 0.003,
+                 on_batch: Callable[[int, list], None] = None):
+        """
+        :param process: Maps a list of items to a list of results of the same length and order.
+        :param max_batch_size: Largest batch handed to process.
+        :param max_wait: Longest time in seconds the first item of a batch waits for company.
+        :param on_batch: Called with the batch size and each item's queue wait, for metrics.
+        """
+        self.process = process
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.on_batch = on_batch
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item and return a future for its result."""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def _ensure_started(self) -> None:
+        # the worker thread does not survive fork, so start one per process on first use
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._run, args=(self._queue,), name="micro-batcher", daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def _run(self, pending: queue.Queue) -> None:
+        while True:
+            batch = [pending.get()]
+            deadline = batch[0][2] + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(pending.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            # drain whatever else already arrived, up to the batch limit
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+            self._process_batch(batch)
+
+    def _process_batch(self, batch: list) -> None:
+        started = time.perf_counter()
+        if self.on_batch is not None:
+            self.on_batch(len(batch), [started - enqueued for _, _, enqueued in batch])
+        try:
+            results = list(self.process([item for item, _, _ in batch]))
+            if len(results) != len(batch):
+                # a short result list would leave the remaining callers waiting forever
+                raise RuntimeError(f"Batch of {len(batch)} items produced {len(results)} results")
+        except Exception as e:
+            logger.exception("Micro-batch failed")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
@@ -0,0 +1,111 @@
+import os
+import re
+import json
+import numpy as np
+import scipy.sparse
+from scipy.special import expit
+
+# CountVectorizer's default token pattern, applied to lowercased text
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+SCORER_FORMAT_VERSION = 1
+
+class VocabularyVectorizer:
+    """
+    Minimal stand-in for a fitted CountVectorizer with default tokenization.
+
+    Produces the same CSR count matrix (sorted indices, int64 counts) from the exported
+    vocabulary, without importing scikit-learn.
+    """
+    def __init__(self, terms: list):
+        self.vocabulary_ = {term: index for index, term in enumerate(terms)}
+
+    def transform(self, texts: list) -> scipy.sparse.csr_matrix:
+        vocabulary = self.vocabulary_
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            counts = {}
+            for token in TOKEN_PATTERN.findall(text.lower()):
+                index = vocabulary.get(token)
+                if index is not None:
+                    counts[index] = counts.get(index, 0) + 1
+            for index in sorted(counts):
+                indices.append(index)
+                data.append(counts[index])
+            indptr.append(len(indices))
+        return scipy.sparse.csr_matrix(
+            (np.asarray(data, dtype=np.int64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int32)),
+            shape=(len(texts), len(vocabulary))
+        )
+
+class LinearScorer:
+    """
+    Scores a binary linear model as sigmoid(X @ w + b) straight on a CSR matrix.
+
+    Exposes the parts of the scikit-learn classifier API the serving path uses
+    (predict, predict_proba, classes_, n_features_in_), so it can stand in for the
+    estimator in a ServingBundle.
+    """
+    def __init__(self, coef: np.ndarray, intercept: float, classes: np.ndarray, vocabulary: list = None):
+        self.coef = coef
+        self.intercept = float(intercept)
+        self.classes_ = classes
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_estimator(cls, model, vectorizer) -> "LinearScorer":
+        """Extract the weights of a fitted binary linear classifier and, for BoW, its vocabulary."""
+        if model.coef_.shape[0] != 1:
+            raise ValueError("LinearScorer only supports binary classifiers")
+        vocabulary = None
+        if hasattr(vectorizer, 'vocabulary_'):
+            params = vectorizer.get_params()
+            if (not params['lowercase'] or params['token_pattern'] != TOKEN_PATTERN.pattern
+                    or params['ngram_range'] != (1, 1) or params['analyzer'] != 'word'
+                    or params['preprocessor'] is not None or params['tokenizer'] is not None
+                    or params['stop_words'] is not None or params['binary']
+                    or params['strip_accents'] is not None or params['dtype'] is not np.int64):
+                raise ValueError("LinearScorer only reproduces CountVectorizer's default tokenization")
+            vocabulary = [None] * len(vectorizer.vocabulary_)
+            for term, index in vectorizer.vocabulary_.items():
+                vocabulary[index] = term
+        return cls(np.ascontiguousarray(model.coef_[0], dtype=np.float64), model.intercept_[0],
+                   np.asarray(model.classes_), vocabulary)
+
+    @property
+    def n_features_in_(self) -> int:
+        return self.coef.shape[0]
+
+    @property
+    def vectorizer(self) -> VocabularyVectorizer:
+        """The exported BoW vectorizer, or None when the model was trained on hashed features."""
+        return VocabularyVectorizer(self.vocabulary) if self.vocabulary is not None else None
+
+    def save(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'coef.npy'), self.coef)
+        np.save(os.path.join(directory, 'classes.npy'), self.classes_)
+        with open(os.path.join(directory, 'scorer.json'), 'w') as file:
+            json.dump({'format_version': SCORER_FORMAT_VERSION, 'intercept': self.intercept,
+                       'vocabulary': self.vocabulary}, file)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "LinearScorer":
+        """Load an exported scorer; with mmap the weights are shared through the page cache."""
+        with open(os.path.join(directory, 'scorer.json'), 'r') as file:
+            meta = json.load(file)
+        if meta['format_version'] != SCORER_FORMAT_VERSION:
+            raise ValueError(f"Unsupported scorer format {meta['format_version']}")
+        coef = np.load(os.path.join(directory, 'coef.npy'), mmap_mode='r' if mmap else None)
+        classes = np.load(os.path.join(directory, 'classes.npy'))
+        return cls(coef, meta['intercept'], classes, meta['vocabulary'])
+
+    def decision_function(self, X) -> np.ndarray:
+        return X @ self.coef + self.intercept
+
+    def predict_proba(self, X) -> np.ndarray:
+        positive = expit(self.decision_function(X))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
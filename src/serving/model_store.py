@@ -0,0 +1,206 @@
+import os
+import pickle
+import logging
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+from src.text import make_hashing_vectorizer
+from src.serving.artifact_cache import ArtifactCache
+from src.serving.linear_scorer import LinearScorer
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class ServingBundle:
+    """A model version together with the vectorizer it was trained with."""
+    version: str
+    model: Any
+    vectorizer: Any
+
+def build_vectorizer(model, vectorizer_path: str, vectorizer_mode: str = "bow"):
+    """Load the pickled vectorizer, or size a hashing vectorizer from the model in hashing mode."""
+    if vectorizer_mode == "hashing":
+        return make_hashing_vectorizer(model.n_features_in_)
+    with open(vectorizer_path, 'rb') as file:
+        return pickle.load(file)
+
+def load_scorer_bundle(version: str, scorer_dir: str) -> ServingBundle:
+    """Load an exported LinearScorer together with the vectorizer it was exported with."""
+    scorer = LinearScorer.load(scorer_dir)
+    vectorizer = scorer.vectorizer or make_hashing_vectorizer(scorer.n_features_in_)
+    return ServingBundle(version, scorer, vectorizer)
+
+class RegistryModelSource:
+    """
+    Serve the latest Production version (or the latest unstaged one) from the MLflow registry.
+
+    With an ArtifactCache, each version is downloaded once per host and every later load,
+    from any worker process, is a local file read. The "numpy" backend fetches only the
+    exported LinearScorer artifact of the version's run instead of the MLflow model.
+    mlflow is imported, and `setup` (e.g. tracking configuration) run, only when the
+    registry is first contacted.
+    """
+    def __init__(self, model_name: str, vectorizer_path: str = 'models/vectorizer.pkl', vectorizer_mode: str = "bow",
+                 cache: ArtifactCache = None, backend: str = "sklearn", setup: Callable[[], Any] = None):
+        self.model_name = model_name
+        self.vectorizer_path = vectorizer_path
+        self.vectorizer_mode = vectorizer_mode
+        self.cache = cache
+        self.backend = backend
+        self.setup = setup
+
+    def _mlflow(self):
+        if self.setup is not None:
+            self.setup()
+        import mlflow
+        return mlflow
+
+    def latest_version(self) -> str:
+        client = self._mlflow().MlflowClient()
+        latest_version = client.get_latest_versions(self.model_name, stages=["Production"])
+        if not latest_version:
+            latest_version = client.get_latest_versions(self.model_name, stages=["None"])
+        return latest_version[0].version if latest_version else None
+
+    def load(self, version: str) -> ServingBundle:
+        if self.cache is None:
+            with tempfile.TemporaryDirectory() as download_dir:
+                self.download(version, download_dir)
+                return self._load_local(version, download_dir)
+        return self._load_local(version, self.cache.fetch(self.model_name, version,
+                                                          lambda download_dir: self.download(version, download_dir),
+                                                          variant=self.backend))
+
+    def download(self, version: str, download_dir: str) -> None:
+        """Download the model and, when the run logged one, its vectorizer into download_dir."""
+        mlflow = self._mlflow()
+        run_id = mlflow.MlflowClient().get_model_version(self.model_name, version).run_id
+        if self.backend == "numpy":
+            logger.info(f"Fetching scorer of model {self.model_name} version {version} from run {run_id}")
+            mlflow.artifacts.download_artifacts(run_id=run_id, artifact_path='scorer', dst_path=download_dir)
+            return
+        model_uri = f'models:/{self.model_name}/{version}'
+        logger.info(f"Fetching model from: {model_uri}")
+        mlflow.artifacts.download_artifacts(artifact_uri=model_uri, dst_path=os.path.join(download_dir, 'model'))
+        if self.vectorizer_mode == "hashing":
+            return
+        try:
+            mlflow.artifacts.download_artifacts(run_id=run_id, artifact_path='vectorizer.pkl', dst_path=download_dir)
+        except Exception:
+            logger.warning(f"Run {run_id} has no vectorizer.pkl artifact, using {self.vectorizer_path}")
+
+    def _load_local(self, version: str, model_dir: str) -> ServingBundle:
+        if self.backend == "numpy":
+            return load_scorer_bundle(version, os.path.join(model_dir, 'scorer'))
+        import mlflow.sklearn
+        model = mlflow.sklearn.load_model(os.path.join(model_dir, 'model'))
+        vectorizer_path = os.path.join(model_dir, 'vectorizer.pkl')
+        if not os.path.isfile(vectorizer_path):
+            vectorizer_path = self.vectorizer_path
+        return ServingBundle(version, model, build_vectorizer(model, vectorizer_path, self.vectorizer_mode))
+
+class LocalModelSource:
+    """
+    Local stand-in for the registry: one sub-directory per version holding model.pkl and
+    vectorizer.pkl, or an exported scorer/ directory for the "numpy" backend. The highest
+    version is served; publish a version by renaming a fully written directory into place
+    so the watcher never sees a partial one.
+    """
+    def __init__(self, root: str, vectorizer_mode: str = "bow", backend: str = "sklearn"):
+        self.root = root
+        self.vectorizer_mode = vectorizer_mode
+        self.backend = backend
+
+    def latest_version(self) -> str:
+        if not os.path.isdir(self.root):
+            return None
+        marker = os.path.join('scorer', 'scorer.json') if self.backend == "numpy" else 'model.pkl'
+        versions = [name for name in os.listdir(self.root)
+                    if os.path.isfile(os.path.join(self.root, name, marker))]
+        return max(versions, key=lambda name: (int(name) if name.isdigit() else -1, name), default=None)
+
+    def load(self, version: str) -> ServingBundle:
+        version_dir = os.path.join(self.root, version)
+        if self.backend == "numpy":
+            return load_scorer_bundle(version, os.path.join(version_dir, 'scorer'))
+        with open(os.path.join(version_dir, 'model.pkl'), 'rb') as file:
+            model = pickle.load(file)
+        vectorizer = build_vectorizer(model, os.path.join(version_dir, 'vectorizer.pkl'), self.vectorizer_mode)
+        return ServingBundle(version, model, vectorizer)
+
+class ModelStore:
+    """
+    Holds the bundle currently being served and swaps in new versions as they appear.
+
+    Request handlers read `current` once and use that bundle for the whole request, so a
+    swap never mixes a new model with an old vectorizer and in-flight requests finish on
+    the pair they started with.
+    """
+    def __init__(self, source):
+        self.source = source
+        self._current = None
+        self._listeners = []
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+
+    @property
+    def current(self) -> ServingBundle:
+        """The bundle being served; the first access loads the source's latest version."""
+        bundle = self._current
+        if bundle is None:
+            self.refresh()
+            bundle = self._current
+        return bundle
+
+    def add_listener(self, listener: Callable[[ServingBundle, ServingBundle], None]) -> None:
+        """
+        Register a callback invoked after every swap with the new bundle and the one it
+        replaced, which is None for the initial load. Registering a listener again has no effect.
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def refresh(self) -> bool:
+        """Load and swap in the source's latest version if it differs. Returns True on swap."""
+        with self._refresh_lock:
+            version = self.source.latest_version()
+            if version is None:
+                if self._current is None:
+                    raise RuntimeError("No model version available to serve")
+                return False
+            if self._current is not None and str(version) == self._current.version:
+                return False
+
+            # load fully before publishing; the swap itself is a single reference assignment
+            bundle = self.source.load(str(version))
+            previous, self._current = self._current, bundle
+            logger.info(f"Serving model version {bundle.version}")
+        for listener in self._listeners:
+            listener(bundle, previous)
+        return True
+
+    def start_watcher(self, interval: float, on_error: Callable[[Exception], None] = None) -> None:
+        """Poll the source every `interval` seconds on a daemon thread."""
+        if self._watcher is not None or interval <= 0:
+            return
+
+        def watch():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.exception("Model refresh failed, keeping the current version")
+                    if on_error is not None:
+                        on_error(e)
+
+        self._watcher = threading.Thread(target=watch, name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+        self._stop.clear()
@@ -0,0 +1,93 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with an optional time-to-live.
+
+    It also satisfies the get/set/clear interface expected of a shared backend, so a
+    second instance can stand in for an external store in tests and local runs.
+    """
+    def __init__(self, maxsize: int, ttl: float = 0):
+        """
+        :param maxsize: Maximum number of entries kept.
+        :param ttl: Seconds an entry stays valid; 0 keeps entries until evicted.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+class PredictionCache:
+    """
+    Prediction results keyed by the hash of the normalized text and the model version.
+
+    Lookups go to the local LRU first and then to the optional shared backend (any object
+    with get(key) and set(key, value), e.g. a Redis client wrapper); results are written
+    to both. Because the version is part of the key, a new model never sees old results.
+    """
+    def __init__(self, local: LRUCache, shared=None):
+        self.local = local
+        self.shared = shared
+
+    @staticmethod
+    def key(text: str, model_version: str) -> str:
+        return hashlib.sha256(f"{model_version}\x00{text}".encode('utf-8')).hexdigest()
+
+    def get(self, text: str, model_version: str) -> Any:
+        key = self.key(text, model_version)
+        value = self.local.get(key)
+        if value is None and self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value)
+        return value
+
+    def set(self, text: str, model_version: str, value: Any) -> None:
+        key = self.key(text, model_version)
+        self.local.set(key, value)
+        if self.shared is not None:
+            self.shared.set(key, value)
+
+    def invalidate(self) -> None:
+        """Drop the local entries, e.g. after a model swap; versioned keys keep the shared store safe."""
+        self.local.clear()
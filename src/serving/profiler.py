@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+import logging
+import threading
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+class SamplingProfiler:
+    """
+    In-process sampling profiler built on sys._current_frames.
+
+    While running, a daemon thread records the stack of every other thread each
+    `interval` seconds. The result is in the folded format ("thread;frame;frame count"
+    per line) read by flamegraph.pl and speedscope. Only the process it runs in is
+    sampled; under gunicorn that is the worker that received the start request.
+    """
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._samples = Counter()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: float) -> bool:
+        """Sample for `duration` seconds in the background. Returns False if already running."""
+        with self._lock:
+            if self.running:
+                return False
+            self._samples = Counter()
+            self._thread = threading.Thread(target=self._run, args=(duration,), name="sampling-profiler", daemon=True)
+            self._thread.start()
+        logger.info(f"Sampling profiler started for {duration} seconds")
+        return True
+
+    def _run(self, duration: float) -> None:
+        own_id = threading.get_ident()
+        samples = Counter()
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                samples[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+        self._samples = samples
+
+    def folded(self) -> str:
+        """Stacks of the last completed run, most sampled first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self._samples.most_common())
@@ -0,0 +1,4 @@
+from src.text.normalizer import (
+    DEFAULT_LEMMA_CACHE_SIZE, NORMALIZER_VERSION, TextNormalizer, default_normalizer, normalize_text
+)
+from src.text.hashing import make_hashing_vectorizer
@@ -0,0 +1,12 @@
+def make_hashing_vectorizer(n_features: int):
+    """
+    Build the stateless hashing vectorizer used when feature_engineering.vectorizer is 'hashing'.
+
+    Tokens are hashed into n_features buckets with raw counts (no sign flipping, no
+    normalization), so the features match what CountVectorizer would produce for the
+    same vocabulary, minus collisions. Nothing is fitted, so training and serving only
+    need to agree on n_features. scikit-learn is imported here so that serving the
+    NumPy scorer never loads it.
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
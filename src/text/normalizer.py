@@ -0,0 +1,107 @@
+import os
+import re
+import string
+from functools import lru_cache
+from typing import Callable, Iterable
+
+# Review vocabulary is Zipfian, so a few tens of thousands of lemmas cover nearly every token
+DEFAULT_LEMMA_CACHE_SIZE = 50000
+
+# URLs are stripped before any other cleaning so their fragments never become tokens
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+
+# Identifies the output of TextNormalizer; bump it whenever a change alters normalized
+# text, so cached normalizations (see src.data.normalization_cache) are recomputed
+NORMALIZER_VERSION = "1"
+
+class _StripTable(dict):
+    """
+    Translation table for str.translate that drops digits and the Arabic semicolon
+    and replaces ASCII punctuation with a space.
+
+    Code points are classified the first time they are seen and memoized, so the
+    whole strip step is a single C-level scan over the review.
+    """
+    punctuation = frozenset(string.punctuation)
+
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        if char.isdigit() or char == '؛':
+            value = None
+        elif char in self.punctuation:
+            value = ' '
+        else:
+            value = codepoint
+        self[codepoint] = value
+        return value
+
+_STRIP_TABLE = _StripTable()
+
+class TextNormalizer:
+    """
+    Review normalizer shared by the training pipeline and the Flask app.
+
+    Removes URLs, digits and punctuation, lowercases, drops English stop words and
+    lemmatizes what is left. Stop words and the lemmatizer are loaded once, on first use,
+    and lemmas are kept in a bounded LRU cache so repeated tokens skip the WordNet lookup.
+    """
+    def __init__(self, stop_words: Iterable[str] = None, lemmatize: Callable[[str], str] = None,
+                 lemma_cache_size: int = DEFAULT_LEMMA_CACHE_SIZE):
+        """
+        :param stop_words: Words to drop. Defaults to the NLTK English stop word list.
+        :param lemmatize: Callable mapping a token to its lemma. Defaults to WordNetLemmatizer.
+        :param lemma_cache_size: Maximum number of cached lemmas; 0 disables caching.
+        """
+        self._stop_words = frozenset(stop_words) if stop_words is not None else None
+        self._base_lemmatize = lemmatize
+        self._lemmatize = None
+        self.lemma_cache_size = lemma_cache_size
+
+    @property
+    def stop_words(self) -> frozenset:
+        if self._stop_words is None:
+            from nltk.corpus import stopwords
+            self._stop_words = frozenset(stopwords.words("english"))
+        return self._stop_words
+
+    @property
+    def lemmatize(self) -> Callable[[str], str]:
+        if self._lemmatize is None:
+            base_lemmatize = self._base_lemmatize
+            if base_lemmatize is None:
+                from nltk.stem import WordNetLemmatizer
+                base_lemmatize = WordNetLemmatizer().lemmatize
+            self._lemmatize = lru_cache(maxsize=self.lemma_cache_size)(base_lemmatize)
+        return self._lemmatize
+
+    def lemma_cache_info(self):
+        """Return the (hits, misses, maxsize, currsize) statistics of the lemma cache."""
+        return self.lemmatize.cache_info()
+
+    def __getstate__(self) -> dict:
+        # The lemma cache is per process; copies sent to worker processes start empty
+        state = self.__dict__.copy()
+        state['_lemmatize'] = None
+        return state
+
+    def tokens(self, text: str) -> list:
+        """Return the normalized tokens of a single review."""
+        stop_words = self.stop_words
+        lemmatize = self.lemmatize
+        words = URL_PATTERN.sub('', text).translate(_STRIP_TABLE).lower().split()
+        return [lemmatize(word) for word in words if word not in stop_words]
+
+    def __call__(self, text: str) -> str:
+        return " ".join(self.tokens(text))
+
+_default_normalizer = TextNormalizer(
+    lemma_cache_size=int(os.getenv("LEMMA_CACHE_SIZE", DEFAULT_LEMMA_CACHE_SIZE))
+)
+
+def default_normalizer() -> TextNormalizer:
+    """Return the process-wide normalizer used by normalize_text."""
+    return _default_normalizer
+
+def normalize_text(text: str) -> str:
+    """Normalize a single review with the process-wide default normalizer."""
+    return _default_normalizer(text)
@@ -0,0 +1,50 @@
+import os
+import time
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from src.serving import ArtifactCache
+
+def fake_download(download_dir, log_path):
+    """Pretend to fetch from the registry, recording every call in log_path."""
+    with open(log_path, 'a') as log:
+        log.write('download\n')
+    time.sleep(0.2)
+    os.makedirs(os.path.join(download_dir, 'model'))
+    with open(os.path.join(download_dir, 'model', 'model.pkl'), 'wb') as file:
+        file.write(b'weights')
+
+def fetch(root, log_path):
+    return ArtifactCache(root).fetch('my_model', '3', lambda download_dir: fake_download(download_dir, log_path))
+
+class ArtifactCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp_dir.name, 'cache')
+        self.log_path = os.path.join(self.tmp_dir.name, 'downloads.log')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def download_count(self):
+        with open(self.log_path) as log:
+            return len(log.readlines())
+
+    def test_concurrent_workers_download_once(self):
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            entries = list(executor.map(fetch, [self.root] * 4, [self.log_path] * 4))
+        self.assertEqual(len(set(entries)), 1)
+        self.assertEqual(self.download_count(), 1)
+        with open(os.path.join(entries[0], 'model', 'model.pkl'), 'rb') as file:
+            self.assertEqual(file.read(), b'weights')
+
+    def test_corrupt_entry_is_fetched_again(self):
+        entry = fetch(self.root, self.log_path)
+        with open(os.path.join(entry, 'model', 'model.pkl'), 'wb') as file:
+            file.write(b'truncated')
+        fetch(self.root, self.log_path)
+        self.assertEqual(self.download_count(), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import asyncio
+import unittest
+from flask_app.asgi import app
+
+def call(method, path, body=b""):
+    """Drive the ASGI app for one request and return (status, body)."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": []}
+    asyncio.run(app(scope, receive, send))
+    return messages[0]["status"], b"".join(message.get("body", b"") for message in messages[1:])
+
+class ASGIAppTest(unittest.TestCase):
+
+    def test_home_page(self):
+        status, body = call("GET", "/")
+        self.assertEqual(status, 200)
+        self.assertIn(b'<title>Sentiment Analysis</title>', body)
+
+    def test_predict_page(self):
+        status, body = call("POST", "/predict", b"text=I+love+this%21")
+        self.assertEqual(status, 200)
+        self.assertTrue(b'Positive' in body or b'Negative' in body)
+        # an empty review is scored like the Flask route does, not rejected
+        status, _ = call("POST", "/predict", b"text=")
+        self.assertEqual(status, 200)
+
+    def test_predict_batch(self):
+        status, body = call("POST", "/predict/batch", json.dumps({"reviews": ["Great!", "Awful."]}).encode())
+        self.assertEqual(status, 200)
+        self.assertEqual(len(json.loads(body)["labels"]), 2)
+        status, _ = call("POST", "/predict/batch", b"not json")
+        self.assertEqual(status, 400)
+
+    def test_lifespan_startup_loads_model(self):
+        messages = []
+        incoming = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+
+        async def receive():
+            return next(incoming)
+
+        async def send(message):
+            messages.append(message["type"])
+
+        asyncio.run(app({"type": "lifespan"}, receive, send))
+        self.assertEqual(messages, ["lifespan.startup.complete", "lifespan.shutdown.complete"])
+        self.assertIsNotNone(app.extensions["model_store"]._current)
+
+    def test_metrics_are_shared_with_flask(self):
+        call("GET", "/")
+        status, body = call("GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertIn(b'app_request_count_total{endpoint="/",method="GET"}', body)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from src.serving import MicroBatcher
+
+class MicroBatcherTest(unittest.TestCase):
+
+    def test_concurrent_items_are_batched_in_order(self):
+        batch_sizes = []
+        batcher = MicroBatcher(lambda items: [item * 2 for item in items], max_batch_size=8, max_wait=0.05,
+                               on_batch=lambda size, waits: batch_sizes.append(size))
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(lambda item: batcher.submit(item).result(timeout=5), range(32)))
+        self.assertEqual(results, [item * 2 for item in range(32)])
+        self.assertEqual(sum(batch_sizes), 32)
+        self.assertLessEqual(max(batch_sizes), 8)
+        self.assertLess(len(batch_sizes), 32)
+
+    def test_failures_reach_every_caller(self):
+        def process(items):
+            raise ValueError("model unavailable")
+
+        batcher = MicroBatcher(process, max_wait=0.01)
+        futures = [batcher.submit(item) for item in range(3)]
+        for future in futures:
+            with self.assertRaises(ValueError):
+                future.result(timeout=5)
+
+    def test_short_results_fail_every_caller(self):
+        batcher = MicroBatcher(lambda items: [], max_wait=0.01)
+        futures = [batcher.submit(item) for item in range(3)]
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from benchmarks.serving_latency import STAGES, make_reviews, run_benchmarks, train_local_model
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'notebooks', 'data.csv')
+
+class ServingLatencyBenchmarkTest(unittest.TestCase):
+
+    def test_reviews_have_requested_length_and_are_distinct(self):
+        reviews = make_reviews(["one two three four five six"], 10, 5)
+        self.assertTrue(all(len(review.split()) == 10 for review in reviews))
+        self.assertEqual(len(set(reviews)), 5)
+
+    def test_suite_runs_offline_on_a_local_model(self):
+        corpus = pd.read_csv(DATA_PATH)['review'].tolist()
+        with tempfile.TemporaryDirectory() as model_root:
+            train_local_model(DATA_PATH, model_root)
+            results = run_benchmarks(model_root, corpus, [20], [1, 2], n_calls=5)
+        self.assertEqual([(r['stage'], r['concurrency']) for r in results],
+                         [(stage, concurrency) for concurrency in (1, 2) for stage in STAGES])
+        for record in results:
+            self.assertLessEqual(record['p50_ms'], record['p99_ms'])
+            self.assertGreater(record['throughput_per_second'], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+import pyarrow.parquet as pq
+from src.data.columnar import read_parquet, write_parquet
+from src.data.data_preprocessing import preprocess_parquet_streaming, preprocess_dataframe
+from src.data.normalization_cache import NormalizationCache
+from src.text import TextNormalizer
+
+def fake_lemmatize(word):
+    return word[:-1] if word.endswith("s") and len(word) > 3 else word
+
+def write_and_read(df):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'df.parquet')
+        write_parquet(df, path)
+        return read_parquet(path)
+
+class PreprocessDataFrameTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        reviews = [
+            f"Review {i}: the films were GREAT, see http://example.com/{i} for {i % 7} more plots!"
+            for i in range(250)
+        ]
+        cls.df = pd.DataFrame({'review': reviews, 'sentiment': [i % 2 for i in range(250)]})
+        cls.normalizer = TextNormalizer(stop_words={"the", "were", "for", "see"}, lemmatize=fake_lemmatize)
+
+    def test_parallel_output_is_identical_to_serial(self):
+        serial = preprocess_dataframe(self.df.copy(), 'review', self.normalizer, n_jobs=1)
+        parallel = preprocess_dataframe(self.df.copy(), 'review', self.normalizer, n_jobs=3, chunk_size=16)
+        self.assertEqual(serial.to_csv(index=False), parallel.to_csv(index=False))
+
+    def test_small_inputs_start_no_worker_pool(self):
+        expected = preprocess_dataframe(self.df.copy(), 'review', self.normalizer).to_csv(index=False)
+        with mock.patch('src.data.data_preprocessing.ProcessPoolExecutor', side_effect=AssertionError("pool started")), \
+                tempfile.TemporaryDirectory() as tmp_dir:
+            small = preprocess_dataframe(self.df.copy(), 'review', self.normalizer, n_jobs=4, chunk_size=len(self.df))
+            self.assertEqual(small.to_csv(index=False), expected)
+
+            input_path = os.path.join(tmp_dir, 'raw.parquet')
+            write_parquet(self.df, input_path)
+            rows = preprocess_parquet_streaming(input_path, os.path.join(tmp_dir, 'processed.parquet'), 'review',
+                                                self.normalizer, n_jobs=4, chunk_size=len(self.df))
+            self.assertEqual(rows, len(self.df))
+
+    def test_streaming_output_is_identical_to_in_memory(self):
+        expected = preprocess_dataframe(self.df.copy(), 'review', self.normalizer)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_path = os.path.join(tmp_dir, 'raw.parquet')
+            output_path = os.path.join(tmp_dir, 'interim', 'processed.parquet')
+            write_parquet(self.df, input_path)
+
+            rows = preprocess_parquet_streaming(input_path, output_path, 'review', self.normalizer,
+                                                n_jobs=2, chunk_size=8, read_chunk_size=40)
+            streamed = read_parquet(output_path)
+            # one row group per input batch, with the label column dictionary-encoded
+            metadata = pq.ParquetFile(output_path).metadata
+            self.assertEqual(metadata.num_row_groups, 7)
+            self.assertIn('RLE_DICTIONARY', metadata.row_group(0).column(1).encodings)
+            self.assertEqual(metadata.row_group(0).column(0).compression, 'ZSTD')
+
+            # an input without rows still yields a readable, empty dataset
+            write_parquet(self.df.iloc[:0], input_path)
+            self.assertEqual(preprocess_parquet_streaming(input_path, output_path, 'review', self.normalizer), 0)
+            self.assertEqual(list(read_parquet(output_path).columns), ['review', 'sentiment'])
+        self.assertEqual(rows, len(self.df))
+        pd.testing.assert_frame_equal(streamed, write_and_read(expected))
+
+    def test_cache_only_normalizes_new_reviews(self):
+        calls = []
+        def counting_lemmatize(word):
+            calls.append(word)
+            return fake_lemmatize(word)
+        normalizer = TextNormalizer(stop_words={"the", "were", "for", "see"}, lemmatize=counting_lemmatize,
+                                    lemma_cache_size=0)
+        expected = preprocess_dataframe(self.df.copy(), 'review', self.normalizer)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, 'normalized.sqlite')
+            with NormalizationCache(cache_path, version="test") as cache:
+                first = preprocess_dataframe(self.df.iloc[:200].copy(), 'review', normalizer, cache=cache)
+            self.assertTrue(calls)
+
+            # a later run over the appended data only normalizes the 50 new reviews
+            calls.clear()
+            normalizer(self.df['review'].iloc[200:].str.cat(sep=' '))
+            new_review_calls = len(calls)
+            calls.clear()
+            with NormalizationCache(cache_path, version="test") as cache:
+                second = preprocess_dataframe(self.df.copy(), 'review', normalizer, cache=cache)
+                self.assertEqual((cache.hits, cache.misses), (200, 50))
+            self.assertEqual(len(calls), new_review_calls)
+            self.assertEqual(second.to_csv(index=False), expected.to_csv(index=False))
+            self.assertEqual(first.to_csv(index=False), expected.iloc[:200].to_csv(index=False))
+
+            # a new normalizer version misses every entry; the misses go to the worker pool
+            with NormalizationCache(cache_path, version="test-2") as cache:
+                third = preprocess_dataframe(self.df.copy(), 'review', normalizer, n_jobs=2, chunk_size=8,
+                                             cache=cache)
+                self.assertEqual((cache.hits, cache.misses), (0, 250))
+            self.assertEqual(third.to_csv(index=False), expected.to_csv(index=False))
+
+if __name__ == "__main__":
+    unittest.main()
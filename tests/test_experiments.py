@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import MultinomialNB
+from src.experiments import ResourceLimits, build_feature_sets, run_grid
+
+class SpinningClassifier(BaseEstimator, ClassifierMixin):
+    """Never finishes fitting on its own; only a CPU limit stops it."""
+    def fit(self, X, y):
+        while True:
+            pass
+
+class ExperimentRunnerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        words = ["great", "awful", "plot", "cast", "boring", "fun", "slow", "brilliant"]
+        texts = [" ".join(words[(i * j) % len(words)] for j in range(1, 6)) for i in range(80)]
+        cls.texts = pd.Series(texts)
+        cls.labels = pd.Series([i % 2 for i in range(80)])
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.vectorizers = {'BoW': CountVectorizer(), 'TF-IDF': TfidfVectorizer()}
+        cls.feature_sets = build_feature_sets(cls.texts, cls.labels, cls.vectorizers, cls.tmp_dir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_feature_sets_are_fitted_once_and_reused(self):
+        self.assertEqual(len(os.listdir(self.tmp_dir.name)), 4 * len(self.vectorizers))
+        mtimes = {name: os.path.getmtime(os.path.join(self.tmp_dir.name, name)) for name in os.listdir(self.tmp_dir.name)}
+        again = build_feature_sets(self.texts, self.labels, self.vectorizers, self.tmp_dir.name)
+        self.assertEqual(again, self.feature_sets)
+        self.assertEqual(mtimes, {name: os.path.getmtime(os.path.join(self.tmp_dir.name, name)) for name in mtimes})
+
+    def test_grid_runs_every_combination(self):
+        algorithms = {'LogisticRegression': LogisticRegression(), 'MultinomialNB': MultinomialNB()}
+        results = run_grid(algorithms, self.feature_sets, max_workers=2)
+        self.assertEqual([(r['algorithm'], r['vectorizer']) for r in results],
+                         [(a, v) for a in algorithms for v in self.vectorizers])
+        for result in results:
+            self.assertIsNone(result['error'])
+            self.assertTrue(0 <= result['metrics']['accuracy'] <= 1)
+        self.assertEqual(results[0]['params'], {'C': 1.0})
+
+    def test_cpu_limit_stops_a_job_without_breaking_the_sweep(self):
+        algorithms = {'Spinning': SpinningClassifier(), 'LogisticRegression': LogisticRegression()}
+        results = run_grid(algorithms, self.feature_sets[:1], max_workers=1, limits=ResourceLimits(cpu_seconds=1))
+        self.assertIn("CPULimitExceeded", results[0]['error'])
+        self.assertIsNone(results[1]['error'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,12 @@
+import os
+import time
 import unittest
-from flask_app.app import app
+from unittest import mock
+import tempfile
+import numpy as np
+from flask_app.app import app, create_app, on_model_swap, registry
+from src.serving import LocalModelSource, ModelStore
+from tests.test_model_store import publish_version
 
 class FlaskAppTest(unittest.TestCase):
 
@@ -19,6 +26,75 @@ class FlaskAppTest(unittest.TestCase):
             b'Positive' in response.data or b'Negative' in response.data,
             "Response should be either 'Positive' or 'Negative'."
         )
+
+    def test_predict_batch(self):
+        reviews = ["I love this!", "Worst movie I have ever seen.", "It was okay."]
+        response = self.client.post('/predict/batch', json=dict(reviews=reviews))
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(len(body['labels']), len(reviews))
+        self.assertEqual(len(body['probabilities']), len(reviews))
+        self.assertTrue(all(label in (0, 1) for label in body['labels']))
+        self.assertTrue(all(0.0 <= p <= 1.0 for p in body['probabilities']))
+
+    def test_repeated_reviews_are_served_from_cache(self):
+        reviews = ["A cached review, scored once.", "Another cached review."]
+        first = self.client.post('/predict/batch', json=dict(reviews=reviews))
+        self.assertEqual(first.status_code, 200)
+        hits = registry.get_sample_value('prediction_cache_hits_total')
+        second = self.client.post('/predict/batch', json=dict(reviews=reviews))
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(registry.get_sample_value('prediction_cache_hits_total'), hits + len(reviews))
+        self.assertEqual(first.get_json(), second.get_json())
+
+    def test_initial_load_is_not_counted_as_reload(self):
+        bundle = app.extensions["model_store"].current
+        reloads = lambda: registry.get_sample_value('model_reload_count_total', {'result': 'success'}) or 0
+        before = reloads()
+        on_model_swap(bundle, None)
+        self.assertEqual(reloads(), before)
+        on_model_swap(bundle, bundle)
+        self.assertEqual(reloads(), before + 1)
+
+    def test_injected_store_publishes_version_metrics(self):
+        reloads = lambda: registry.get_sample_value('model_reload_count_total', {'result': 'success'}) or 0
+        with tempfile.TemporaryDirectory() as root:
+            publish_version(root, '7', ["good film", "bad film"], np.array([1, 0]))
+            model_store = ModelStore(LocalModelSource(root))
+            create_app(model_store=model_store)
+            before = reloads()
+            model_store.current
+            self.assertEqual(registry.get_sample_value('model_active_version'), 7)
+            publish_version(root, '8', ["great plot", "awful plot"], np.array([1, 0]))
+            model_store.refresh()
+            self.assertEqual(registry.get_sample_value('model_active_version'), 8)
+            self.assertEqual(reloads(), before + 1)
+
+    def test_stage_and_input_size_metrics(self):
+        self.client.post('/predict', data=dict(text="Stage timing for this review."))
+        metrics = self.client.get('/metrics').data
+        for stage in (b'normalize', b'vectorize', b'predict', b'render'):
+            self.assertIn(b'predict_stage_latency_seconds_count{stage="' + stage + b'"}', metrics)
+        self.assertIn(b'review_length_chars_count', metrics)
+        self.assertIn(b'review_length_tokens_count', metrics)
+
+    def test_admin_profile_requires_token(self):
+        with mock.patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("ADMIN_TOKEN", None)
+            self.assertEqual(self.client.post('/admin/profile').status_code, 404)
+        with mock.patch.dict(os.environ, {"ADMIN_TOKEN": "secret"}):
+            self.assertEqual(self.client.post('/admin/profile', headers={"X-Admin-Token": "wrong"}).status_code, 403)
+            headers = {"X-Admin-Token": "secret"}
+            self.assertEqual(self.client.post('/admin/profile?seconds=0.1', headers=headers).status_code, 202)
+            while self.client.get('/admin/profile', headers=headers).status_code == 202:
+                time.sleep(0.05)
+            response = self.client.get('/admin/profile', headers=headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b'MainThread', response.data)
+
+    def test_predict_batch_rejects_invalid_payload(self):
+        response = self.client.post('/predict/batch', json=dict(reviews="not a list"))
+        self.assertEqual(response.status_code, 400)
     
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import unittest
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Cold import budget for the serving path, in milliseconds
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+
+def run_python(code: str, *flags: str, env: dict = None) -> subprocess.CompletedProcess:
+    """Run code in a fresh interpreter without tracking credentials; `env` adds variables."""
+    env = {**{key: value for key, value in os.environ.items() if key not in ("CAPSTONE_TEST", "MLFLOW_TRACKING_URI")},
+           **(env or {})}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")]))
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=REPO_ROOT, env=env,
+                          capture_output=True, text=True, timeout=120)
+
+class ImportTimeTest(unittest.TestCase):
+
+    def test_imports_have_no_tracking_side_effects(self):
+        result = run_python(
+            "import sys\n"
+            "import flask_app.app\n"
+            "serving = sorted(m for m in ('mlflow', 'dagshub', 'boto3', 'sklearn') if m in sys.modules)\n"
+            "import src.model.model_evaluation, src.model.register_model, src.data.data_preprocessing\n"
+            "pipeline = sorted(m for m in ('mlflow', 'dagshub', 'boto3') if m in sys.modules)\n"
+            "print(serving, pipeline)"
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "[] []")
+
+    def test_serving_import_starts_no_threads_and_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as home:
+            result = run_python(
+                "import threading\n"
+                "before = {thread.ident for thread in threading.enumerate()}\n"
+                "import flask_app.app\n"
+                "print(sorted(thread.name for thread in threading.enumerate() if thread.ident not in before))",
+                env={"HOME": home, "MODEL_CACHE_DIR": os.path.join(home, "models")}
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual(result.stdout.strip(), "[]")
+            self.assertEqual(os.listdir(home), [])
+
+    def test_serving_import_within_budget(self):
+        result = run_python("import flask_app.app", "-X", "importtime")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        # -X importtime lines read "import time: self [us] | cumulative | module"
+        cumulative_us = [int(line.split("|")[1]) for line in result.stderr.splitlines()
+                         if line.startswith("import time:") and line.rstrip().endswith("| flask_app.app")]
+        self.assertEqual(len(cumulative_us), 1, result.stderr[-2000:])
+        self.assertLess(cumulative_us[0] / 1000, IMPORT_TIME_BUDGET_MS)
+
+if __name__ == "__main__":
+    unittest.main()
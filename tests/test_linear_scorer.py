@@ -0,0 +1,49 @@
+import tempfile
+import unittest
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
+from src.serving import LinearScorer
+
+TRAIN_TEXTS = [
+    "great movie with a brilliant cast", "awful plot and terrible acting", "brilliant brilliant film",
+    "terrible waste of time", "loved every minute of it", "boring and awful", "great great great",
+    "worst film ever made",
+]
+TRAIN_LABELS = np.array([1, 0, 1, 0, 1, 0, 1, 0])
+
+class LinearScorerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.vectorizer = CountVectorizer()
+        cls.model = LogisticRegression().fit(cls.vectorizer.fit_transform(TRAIN_TEXTS), TRAIN_LABELS)
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        LinearScorer.from_estimator(cls.model, cls.vectorizer).save(cls.tmp_dir.name)
+        cls.scorer = LinearScorer.load(cls.tmp_dir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_vectorizer_matches_count_vectorizer(self):
+        texts = ["GREAT movie, great CAST!", "a", "", "Plot-twist: brilliant_film ÉTÉ awful... 10/10"]
+        expected = self.vectorizer.transform(texts)
+        actual = self.scorer.vectorizer.transform(texts)
+        self.assertEqual(actual.shape, expected.shape)
+        self.assertTrue(np.array_equal(actual.toarray(), expected.toarray()))
+
+    def test_scores_match_sklearn(self):
+        X = self.vectorizer.transform(TRAIN_TEXTS + ["great but boring", "nothing known here"])
+        np.testing.assert_allclose(self.scorer.predict_proba(X), self.model.predict_proba(X))
+        np.testing.assert_array_equal(self.scorer.predict(X), self.model.predict(X))
+
+    def test_rejects_custom_tokenization(self):
+        for vectorizer in (CountVectorizer(ngram_range=(1, 2)), CountVectorizer(strip_accents='unicode'),
+                           CountVectorizer(dtype=np.float32)):
+            model = LogisticRegression().fit(vectorizer.fit_transform(TRAIN_TEXTS), TRAIN_LABELS)
+            with self.assertRaises(ValueError):
+                LinearScorer.from_estimator(model, vectorizer)
+
+if __name__ == "__main__":
+    unittest.main()
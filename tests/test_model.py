@@ -1,9 +1,9 @@
 import unittest
 import mlflow
 import os
-import pandas as pd
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 import pickle
+from src.features.feature_store import load_features
 
 class TestModelLoading(unittest.TestCase):
 
@@ -34,7 +34,7 @@ class TestModelLoading(unittest.TestCase):
         cls.vectorizer = pickle.load(open('models/vectorizer.pkl', 'rb'))
 
         # load the holdout test data
-        cls.holdout_data = pd.read_csv('data/processed/test_bow.csv')
+        cls.X_holdout, cls.y_holdout = load_features('data/processed/test_bow.npz')
     
     @staticmethod
     def get_latest_model_version(model_name, stage="Staging"):
@@ -49,22 +49,25 @@ class TestModelLoading(unittest.TestCase):
         # create a dummy input for the model based on expected input shape
         input_text = "hi how are you"
         input_data = self.vectorizer.transform([input_text])
-        input_df = pd.DataFrame(input_data.toarray(), columns=[str(i) for i in range(input_data.shape[1])])
 
-        # predict using the new model to verify the input and output shapes 
-        prediction = self.new_model.predict(input_df)
+        # predict on the sparse matrix to verify the input and output shapes 
+        prediction = self.new_model.predict(input_data)
 
-        # verfiy the input shape
-        self.assertEqual(input_df.shape[1], len(self.vectorizer.get_feature_names_out()))
+        # verfiy the input shape (hashing vectorizers have a fixed bucket count instead of a vocabulary)
+        if hasattr(self.vectorizer, 'n_features'):
+            expected_features = self.vectorizer.n_features
+        else:
+            expected_features = len(self.vectorizer.get_feature_names_out())
+        self.assertEqual(input_data.shape[1], expected_features)
 
         # verify the output shape (assuming binary classfication with single output)
-        self.assertEqual(len(prediction), input_df.shape[0])
+        self.assertEqual(len(prediction), input_data.shape[0])
         self.assertEqual(len(prediction.shape), 1) # assuming a single ouput column for binary classfication
 
     def test_model_performance(self):
         # Extract features and labels from holdout test data
-        X_test = self.holdout_data.iloc[:, 0: -1]
-        y_test = self.holdout_data.iloc[:, -1]
+        X_test = self.X_holdout
+        y_test = self.y_holdout
 
         # predict using the new model
         y_pred = self.new_model.predict(X_test)
@@ -0,0 +1,75 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+import scipy.sparse
+from sklearn.feature_extraction.text import CountVectorizer
+from src.features.feature_store import save_features
+from src.model.model_building import (RowsFingerprint, feature_space_fingerprint, save_model, train_model_online)
+
+class OnlineTrainingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.X = scipy.sparse.csr_matrix(rng.integers(0, 3, size=(40, 5)))
+        self.y = rng.integers(0, 2, size=40)
+        self.features_path = os.path.join(self.tmp_dir.name, 'train_bow.npz')
+        self.model_path = os.path.join(self.tmp_dir.name, 'model.pkl')
+        self.vectorizer_path = os.path.join(self.tmp_dir.name, 'vectorizer.pkl')
+        self.save_vectorizer(["good film", "bad film", "great cast", "dull plot", "fine"])
+
+        # the checkpoint covers the first 20 rows
+        save_features(self.X[:20], self.y[:20], self.features_path)
+        clf, start_row, fingerprint = train_model_online(self.features_path, self.model_path, {'rows_seen': 0},
+                                                         self.feature_space(), 10)
+        self.assertEqual(start_row, 0)
+        save_model(clf, self.model_path)
+        self.state = {'rows_seen': 20, 'feature_space': self.feature_space(), 'rows_fingerprint': fingerprint}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def save_vectorizer(self, texts):
+        with open(self.vectorizer_path, 'wb') as file:
+            pickle.dump(CountVectorizer(max_features=5).fit(texts), file)
+
+    def feature_space(self):
+        return feature_space_fingerprint(self.vectorizer_path)
+
+    def train(self, X, y, chunk_size=10):
+        save_features(X, y, self.features_path)
+        return train_model_online(self.features_path, self.model_path, self.state, self.feature_space(), chunk_size)
+
+    def test_resumes_on_appended_rows(self):
+        # a different chunk size puts the checkpoint inside a chunk
+        clf, start_row, fingerprint = self.train(self.X, self.y, chunk_size=7)
+        self.assertEqual(start_row, 20)
+        # 20 rows from the checkpoint plus 20 new ones
+        self.assertEqual(clf.t_, 41)
+        full = RowsFingerprint()
+        full.update(self.X, self.y)
+        self.assertEqual(fingerprint, full.hexdigest())
+
+    def test_restarts_when_vocabulary_changes(self):
+        # same shape, different terms in the columns
+        self.save_vectorizer(["new words only", "other terms here", "five"])
+        _, start_row, _ = self.train(self.X, self.y)
+        self.assertEqual(start_row, 0)
+
+    def test_restarts_when_seen_rows_changed(self):
+        order = np.random.default_rng(1).permutation(40)
+        clf, start_row, _ = self.train(self.X[order], self.y[order])
+        self.assertEqual(start_row, 0)
+        self.assertEqual(clf.t_, 41)
+
+    def test_fingerprint_does_not_depend_on_chunking(self):
+        whole, chunked = RowsFingerprint(), RowsFingerprint()
+        whole.update(self.X, self.y)
+        for start in range(0, 40, 13):
+            chunked.update(self.X[start:start + 13], self.y[start:start + 13])
+        self.assertEqual(whole.hexdigest(), chunked.hexdigest())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
+from src.serving import LocalModelSource, ModelStore
+
+def publish_version(root, version, texts, labels):
+    """Write a model/vectorizer pair the way a local registry stand-in would."""
+    vectorizer = CountVectorizer()
+    model = LogisticRegression().fit(vectorizer.fit_transform(texts), labels)
+    version_dir = os.path.join(root, version)
+    os.makedirs(version_dir)
+    with open(os.path.join(version_dir, 'vectorizer.pkl'), 'wb') as file:
+        pickle.dump(vectorizer, file)
+    with open(os.path.join(version_dir, 'model.pkl'), 'wb') as file:
+        pickle.dump(model, file)
+
+class ModelStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self.tmp_dir.name
+        publish_version(self.root, '1', ["good film", "bad film"], np.array([1, 0]))
+        self.store = ModelStore(LocalModelSource(self.root))
+
+    def tearDown(self):
+        self.store.stop_watcher()
+        self.tmp_dir.cleanup()
+
+    def test_refresh_swaps_in_new_version(self):
+        swapped = []
+        self.store.add_listener(lambda bundle, previous: swapped.append((previous and previous.version, bundle.version)))
+        self.assertTrue(self.store.refresh())
+        old_bundle = self.store.current
+
+        publish_version(self.root, '2', ["great plot", "awful plot", "great cast"], np.array([1, 0, 1]))
+        self.assertTrue(self.store.refresh())
+        self.assertFalse(self.store.refresh())
+
+        self.assertEqual(swapped, [(None, '1'), ('1', '2')])
+        self.assertEqual(self.store.current.version, '2')
+        # a request holding the old bundle still sees a consistent model/vectorizer pair
+        self.assertEqual(old_bundle.vectorizer.transform(["good"]).shape[1], old_bundle.model.n_features_in_)
+
+    def test_refresh_without_any_version_fails(self):
+        store = ModelStore(LocalModelSource(os.path.join(self.root, 'missing')))
+        with self.assertRaises(RuntimeError):
+            store.refresh()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import json
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from src.perf import profile_stage, record_counter, record_rows
+
+def burn(n):
+    return sum(i * i for i in range(n))
+
+class ProfileStageTest(unittest.TestCase):
+
+    def test_writes_report_with_rows_and_child_cpu(self):
+        with tempfile.TemporaryDirectory() as report_dir:
+            @profile_stage('toy_stage', report_dir=report_dir)
+            def main():
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    pool.submit(burn, 2_000_000).result()
+                record_rows('train', 42)
+                record_counter('cache_hits', 7)
+                return 'done'
+
+            self.assertEqual(main(), 'done')
+            with open(os.path.join(report_dir, 'toy_stage.json')) as file:
+                report = json.load(file)
+
+        self.assertEqual(report['rows'], {'train': 42})
+        self.assertEqual(report['counters'], {'cache_hits': 7})
+        self.assertGreater(report['wall_seconds'], 0)
+        self.assertGreater(report['cpu_seconds_children'], 0)
+        self.assertGreater(report['peak_rss_mb'], 0)
+
+    def test_failed_stage_writes_no_report(self):
+        with tempfile.TemporaryDirectory() as report_dir:
+            @profile_stage('failing_stage', report_dir=report_dir)
+            def main():
+                raise ValueError("boom")
+
+            with self.assertRaises(ValueError):
+                main()
+            self.assertFalse(os.path.exists(os.path.join(report_dir, 'failing_stage.json')))
+        # rows recorded outside a profiled stage are ignored
+        record_rows('train', 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import time
+import unittest
+from src.serving import LRUCache, PredictionCache
+
+class PredictionCacheTest(unittest.TestCase):
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (2, 1, 1))
+
+    def test_entries_expire_after_ttl(self):
+        cache = LRUCache(maxsize=10, ttl=0.05)
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.expirations, 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_keys_include_model_version(self):
+        cache = PredictionCache(LRUCache(maxsize=10))
+        cache.set('great movie', '3', (1, 0.9))
+        self.assertEqual(cache.get('great movie', '3'), (1, 0.9))
+        self.assertIsNone(cache.get('great movie', '4'))
+        cache.invalidate()
+        self.assertIsNone(cache.get('great movie', '3'))
+
+    def test_shared_backend_fills_local_cache(self):
+        shared = LRUCache(maxsize=10)
+        PredictionCache(LRUCache(maxsize=10), shared).set('fine film', '1', (1, 0.7))
+
+        # a second worker starts cold but finds the result in the shared store
+        other = PredictionCache(LRUCache(maxsize=10), shared)
+        self.assertEqual(other.get('fine film', '1'), (1, 0.7))
+        self.assertEqual(other.local.get(PredictionCache.key('fine film', '1')), (1, 0.7))
+
+if __name__ == "__main__":
+    unittest.main()
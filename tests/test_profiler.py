@@ -0,0 +1,34 @@
+import time
+import threading
+import unittest
+from src.serving import SamplingProfiler
+
+def spin_until(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+class SamplingProfilerTest(unittest.TestCase):
+
+    def test_captures_folded_stacks_of_other_threads(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=spin_until, args=(stop,), name="busy-worker")
+        worker.start()
+        try:
+            profiler = SamplingProfiler(interval=0.001)
+            self.assertTrue(profiler.start(0.2))
+            self.assertFalse(profiler.start(0.2))
+            while profiler.running:
+                time.sleep(0.01)
+        finally:
+            stop.set()
+            worker.join()
+
+        lines = profiler.folded().splitlines()
+        busy = [line for line in lines if line.startswith("busy-worker;")]
+        self.assertTrue(busy)
+        self.assertIn("test_profiler.py:spin_until", busy[0])
+        self.assertFalse(any("sampling-profiler" in line for line in lines))
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in lines))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import unittest
+import pandas as pd
+
+try:
+    import boto3
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
+
+from src.connections.s3_connection import s3_operations
+
+BUCKET_NAME = "review-analysis-test"
+
+@unittest.skipIf(mock_aws is None, "boto3 and moto are required")
+class S3OperationsTest(unittest.TestCase):
+
+    def setUp(self):
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+        self.mock = mock_aws()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET_NAME)
+        self.s3 = s3_operations(BUCKET_NAME, "testing", "testing")
+
+        self.df = pd.DataFrame({
+            'review': [f'Review {i}, with "quotes", commas and a line\nbreak' for i in range(300)],
+            'sentiment': ['positive' if i % 3 else 'negative' for i in range(300)],
+        })
+
+    def put_csv(self, key, df):
+        self.s3.s3_client.put_object(Bucket=BUCKET_NAME, Key=key, Body=df.to_csv(index=False).encode('utf-8'))
+
+    def test_streamed_chunks_match_the_object(self):
+        self.put_csv('data.csv', self.df)
+        chunks = list(self.s3.iter_csv_chunks('data.csv', chunk_size=64))
+        self.assertEqual([len(chunk) for chunk in chunks], [64, 64, 64, 64, 44])
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), self.df)
+
+    def test_ranged_gets_reassemble_the_object(self):
+        self.put_csv('data.csv', self.df)
+        # parts far smaller than a row, so rows and quoted fields straddle part boundaries
+        df = self.s3.fetch_file_from_s3('data.csv', chunk_size=100, part_size=37, max_workers=4,
+                                        usecols=['review'])
+        pd.testing.assert_frame_equal(df, self.df[['review']])
+
+    def test_prefix_shards_are_fetched_in_key_order(self):
+        for shard in range(3):
+            self.put_csv(f'shards/part-{shard:03d}.csv', self.df.iloc[shard * 100:(shard + 1) * 100])
+        self.put_csv('other/part-000.csv', self.df)
+        self.s3.s3_client.put_object(Bucket=BUCKET_NAME, Key='shards/_SUCCESS', Body=b'')
+
+        self.assertEqual(self.s3.list_keys('shards/'), [f'shards/part-{shard:03d}.csv' for shard in range(3)])
+        df = self.s3.fetch_prefix_from_s3('shards/', chunk_size=30, max_workers=2)
+        pd.testing.assert_frame_equal(df, self.df)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import re
+import string
+from src.text import TextNormalizer
+
+STOP_WORDS = {"the", "a", "is", "this", "i", "it", "was", "and", "of"}
+
+def fake_lemmatize(word):
+    return word[:-1] if word.endswith("s") and len(word) > 3 else word
+
+def reference_preprocess(text):
+    """The original data_preprocessing implementation, used as the parity oracle."""
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = ''.join([char for char in text if not char.isdigit()])
+    text = text.lower()
+    text = re.sub('[%s]' % re.escape(string.punctuation), ' ', text)
+    text = text.replace('؛', "")
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = " ".join([word for word in text.split() if word not in STOP_WORDS])
+    text = " ".join([fake_lemmatize(word) for word in text.split()])
+    return text
+
+class TextNormalizerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.normalizer = TextNormalizer(stop_words=STOP_WORDS, lemmatize=fake_lemmatize)
+
+    def test_strips_urls_digits_and_punctuation(self):
+        text = "This movie was GREAT!!! 10/10, see https://imdb.com/title/tt0111161 or www.imdb.com"
+        self.assertEqual(self.normalizer(text), "movie great see or")
+
+    def test_matches_reference_implementation(self):
+        samples = [
+            "I loved the movies, and the actors were brilliant.",
+            "<br /><br />It's a 2-hour mess...   Don't   bother!",
+            "Visit HTTP://EXAMPLE.COM now; it was 5 stars",
+            "Digits² and ١٢٣ Arabic-Indic؛ digits are dropped too",
+            "",
+            "    ",
+        ]
+        for text in samples:
+            self.assertEqual(self.normalizer(text), reference_preprocess(text), text)
+
+    def test_tokens_and_string_agree(self):
+        text = "The plots of these films is thin"
+        self.assertEqual(" ".join(self.normalizer.tokens(text)), self.normalizer(text))
+
+    def test_lemma_cache_counts_hits_and_evicts(self):
+        normalizer = TextNormalizer(stop_words=STOP_WORDS, lemmatize=fake_lemmatize, lemma_cache_size=2)
+        normalizer("films films films plots")
+        info = normalizer.lemma_cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 2))
+        normalizer("actors")
+        self.assertEqual(normalizer.lemma_cache_info().currsize, 2)
+
+if __name__ == "__main__":
+    unittest.main()
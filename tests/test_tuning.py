@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.experiments import tune
+
+class TuningTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        words = ["great", "awful", "plot", "cast", "boring", "fun", "slow", "brilliant"]
+        cls.texts = pd.Series([" ".join(words[(i * j) % len(words)] for j in range(1, 6)) for i in range(120)])
+        cls.labels = pd.Series([i % 2 for i in range(120)])
+        cls.param_grid = {"C": [0.1, 1, 10], "solver": ["liblinear"]}
+
+    def test_grid_reports_holdout_metrics_without_refitting_candidates(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            result = tune(self.texts, self.labels, self.param_grid, cache_dir, cv=3, n_jobs=1)
+            # one TF-IDF fit per fold plus the final refit, shared by every candidate
+            cached = [name for root, _, files in os.walk(cache_dir) for name in files if name == 'output.pkl']
+            self.assertEqual(len(cached), 3 + 1)
+
+        self.assertEqual([c['params']['C'] for c in result.candidates], [0.1, 1, 10])
+        for candidate in result.candidates:
+            self.assertEqual(set(candidate['holdout']), {'accuracy', 'precision', 'recall', 'f1_score'})
+            self.assertTrue(0 <= candidate['holdout']['accuracy'] <= 1)
+        self.assertIn('clf__C', result.search.best_params_)
+        self.assertTrue(0 <= result.best_holdout['f1_score'] <= 1)
+
+    def test_halving_search(self):
+        result = tune(self.texts, self.labels, self.param_grid, search='halving', cv=3, n_jobs=1)
+        self.assertEqual(type(result.search).__name__, 'HalvingGridSearchCV')
+        self.assertEqual(len(result.candidates), len(result.search.cv_results_['params']))
+        self.assertNotIn('holdout', result.candidates[0])
+        self.assertTrue(0 <= result.best_holdout['accuracy'] <= 1)
+
+if __name__ == "__main__":
+    unittest.main()